@@ -1,10 +1,13 @@
-"""Cookidoo Wochenplan-Generator - Flask Web-App."""
+"""Cookidoo Wochenplan-Generator - Flask Web-App mit async Cookidoo-Routen (ASGI)."""
 
 import asyncio
 import logging
 import os
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import wraps
 
 from dotenv import load_dotenv
 
@@ -16,14 +19,23 @@ logging.basicConfig(
 log = logging.getLogger("cookidoo")
 from flask import Flask, jsonify, render_template, request, session
 
+from asgi import ApiRequest, AsyncRoutes
 from auth import (
     admin_required, clear_cookidoo_credentials, create_invite_code,
     delete_invite_code, delete_user, get_all_users, get_cookidoo_credentials,
-    get_invite_codes, get_user_filters, init_db, is_admin, login_required,
-    register_user, reset_user_password, save_cookidoo_credentials,
-    save_user_filters, verify_user,
+    get_cookidoo_tokens, get_invite_codes, get_user_filters, init_db, is_admin,
+    login_required, register_user, reset_user_password, save_cookidoo_credentials,
+    save_cookidoo_tokens, save_user_filters, verify_user,
+)
+from catalog import delete_session_snapshot, init_catalog, load_session_snapshot, save_session_snapshot
+from http_pool import algolia_pool
+from ingredient_index import ingredient_indexes
+from jobs import Job, save_jobs
+from session_store import SessionRegistry
+from planner import (
+    CookidooPlanner, algolia_cache, algolia_flight, algolia_keys, cookidoo_flight,
+    ingredient_facets, load_localizations, recipe_details_cache, refresh_ingredient_facets,
 )
-from planner import CookidooPlanner
 
 load_dotenv()
 
@@ -36,36 +48,221 @@ _loop_thread = threading.Thread(target=_loop.run_forever, daemon=True)
 _loop_thread.start()
 
 
+# Geschätzte Bytes pro Rezept im aktuellen Plan (to_dict-Kopie)
+PLAN_SLOT_BYTES = 1024
+# Alle SESSION_SWEEP_INTERVAL Sekunden werden abgelaufene Sessions geschlossen
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", 60))
+# Nach einer fehlgeschlagenen Wiederherstellung REHYDRATE_BACKOFF Sekunden nicht neu versuchen
+REHYDRATE_BACKOFF = float(os.getenv("REHYDRATE_BACKOFF", 60))
+
+
 @dataclass
 class UserSession:
     planner: CookidooPlanner = field(default_factory=CookidooPlanner)
     current_plan: dict = field(default_factory=dict)
+    # Pool-Version beim letzten Snapshot (Pools nur bei Änderung neu sichern)
+    snapshot_version: int = -1
+
+    def memory_estimate(self) -> int:
+        slots = sum(len(slots) for slots in self.current_plan.values())
+        return self.planner.memory_estimate() + slots * PLAN_SLOT_BYTES
+
+
+def _close_session(username: str, us: UserSession) -> None:
+    """Planner einer verdrängten Session auf dem Event-Loop schliessen (ohne zu warten)."""
+    asyncio.run_coroutine_threadsafe(us.planner.close(), _loop)
+
+
+# Laufende Cookidoo-Requests pro User (nur auf dem Loop verändert)
+_requests_in_flight: dict[str, int] = {}
+
 
+def _session_busy(username: str) -> bool:
+    return username in _requests_in_flight or save_jobs.has_active(username)
 
-# Pro-User Sessions
-_user_sessions: dict[str, UserSession] = {}
+
+# Pro-User Sessions: LRU mit Idle-Ablauf und Speicherbudget; User mit laufendem
+# Request oder Speicher-Job werden nicht verdrängt
+_user_sessions = SessionRegistry(
+    factory=UserSession,
+    on_evict=_close_session,
+    size_of=UserSession.memory_estimate,
+    busy=_session_busy,
+    max_sessions=int(os.getenv("SESSION_MAX", 200)),
+    idle_ttl=float(os.getenv("SESSION_IDLE_TTL", 1800)),
+    memory_budget=int(os.getenv("SESSION_MEMORY_MB", 256)) * 1024 * 1024,
+)
 
 
 def get_user_session(username: str) -> UserSession:
     """Session für einen User holen oder erstellen."""
-    if username not in _user_sessions:
-        _user_sessions[username] = UserSession()
-    return _user_sessions[username]
+    return _user_sessions.get(username)
+
+
+_token_tasks: set[asyncio.Task] = set()
+
+
+def _token_saver(username: str, email: str):
+    """Callback für den Planner: neue Cookidoo-Tokens (Login, Refresh) speichern.
+
+    Wird auf dem Loop aufgerufen; das SQLite-Schreiben läuft im Worker-Thread.
+    """
+    async def write(tokens: dict) -> None:
+        try:
+            await asyncio.to_thread(save_cookidoo_tokens, username, email, tokens)
+        except Exception as e:
+            log.warning(f"[{username}] Cookidoo-Tokens speichern fehlgeschlagen: {e}")
+
+    def save(tokens: dict) -> None:
+        task = asyncio.get_running_loop().create_task(write(tokens))
+        _token_tasks.add(task)
+        task.add_done_callback(_token_tasks.discard)
+    return save
+
+
+async def _rehydrate(username: str, us: UserSession) -> dict | None:
+    """Planner nach Neustart/Verdrängung aus Zugangsdaten und Snapshot neu aufbauen.
+
+    None ohne gespeicherte Zugangsdaten, sonst {"restored": n, "collections": Ergebnis
+    von load_collections oder None, wenn die Pools aus dem Snapshot kamen}.
+    """
+    creds = await asyncio.to_thread(get_cookidoo_credentials, username)
+    if not creds:
+        return None
+    tokens = await asyncio.to_thread(get_cookidoo_tokens, username, creds["email"])
+    await us.planner.login(creds["email"], creds["password"], creds["country"], creds["language"],
+                           tokens=tokens, on_tokens=_token_saver(username, creds["email"]))
+    snapshot = await asyncio.to_thread(load_session_snapshot, username)
+    restored = us.planner.restore_pools(snapshot["pools"]) if snapshot and snapshot["pools"] else 0
+    if snapshot and snapshot["plan"] and not us.current_plan:
+        us.current_plan = snapshot["plan"]
+    collections = None
+    if restored:
+        us.snapshot_version = us.planner.pools_version
+    else:
+        # Kein (passender) Snapshot: Sammlungen wie beim normalen Verbinden laden
+        collections = await us.planner.load_collections()
+    log.info(f"[{username}] Session wiederhergestellt ({restored} Rezepte aus Snapshot)")
+    return {"restored": restored, "collections": collections}
+
+
+# Zeitpunkt (monotonic) der letzten fehlgeschlagenen Wiederherstellung pro User
+_rehydrate_failures: dict[str, float] = {}
+
+
+async def _rehydrate_if_needed(username: str, us: UserSession) -> dict | None:
+    """Nicht eingeloggten Planner wiederherstellen; Ergebnis von _rehydrate oder None.
+
+    Gleichzeitige Requests desselben Users warten auf dieselbe Wiederherstellung.
+    Nach einem Fehlschlag wird REHYDRATE_BACKOFF Sekunden nicht neu versucht.
+    """
+    if us.planner.is_logged_in:
+        return None
+    failed_at = _rehydrate_failures.get(username)
+    if failed_at is not None and time.monotonic() - failed_at < REHYDRATE_BACKOFF:
+        return None
+    try:
+        result = await cookidoo_flight.do(("rehydrate", username), lambda: _rehydrate(username, us))
+    except Exception as e:
+        log.warning(f"[{username}] Session wiederherstellen fehlgeschlagen: {e}")
+        result = None
+    if us.planner.is_logged_in:
+        _rehydrate_failures.pop(username, None)
+    else:
+        _rehydrate_failures[username] = time.monotonic()
+    return result
+
+
+async def get_ready_session(username: str) -> UserSession | None:
+    """Session mit eingeloggtem Planner, bei Bedarf wiederhergestellt; sonst None."""
+    us = get_user_session(username)
+    await _rehydrate_if_needed(username, us)
+    return us if us.planner.is_logged_in else None
+
+
+def _session_unavailable() -> tuple[dict, int]:
+    return {"error": "Cookidoo-Sitzung nicht verfügbar, bitte neu verbinden"}, 401
+
+
+_snapshot_tasks: set[asyncio.Task] = set()
+# Ein Schreib-Thread: Snapshots landen in Auftragsreihenfolge, ein älterer
+# Stand überschreibt nie einen neueren
+_snapshot_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot")
+
+
+def _copy_plan(plan: dict) -> dict:
+    """Plan-Kopie für andere Threads/Jobs; die Rezept-Dicts werden nie verändert."""
+    return {day: dict(slots) for day, slots in plan.items()}
+
+
+def _write_snapshot(username: str, planner: CookidooPlanner | None, plan: dict) -> None:
+    # Läuft im Worker-Thread: Rezeptlisten werden nur ersetzt oder erweitert,
+    # Serialisieren neben dem Loop ist daher unkritisch
+    pools = planner.snapshot_pools() if planner else None
+    save_session_snapshot(username, pools, plan)
+
+
+async def _persist_snapshot(username: str, planner: CookidooPlanner | None, plan: dict) -> None:
+    try:
+        await asyncio.get_running_loop().run_in_executor(_snapshot_writer, _write_snapshot, username, planner, plan)
+    except Exception as e:
+        log.warning(f"[{username}] Snapshot speichern fehlgeschlagen: {e}")
+
+
+def persist_snapshot(username: str, us: UserSession) -> None:
+    """Plan und (falls geändert) Pools im Hintergrund sichern; auf dem Loop aufrufen.
+
+    Auf dem Loop wird nur die Pool-Version verglichen und der Plan flach
+    kopiert; Serialisieren und Schreiben laufen in einem Worker-Thread.
+    """
+    version = us.planner.pools_version
+    planner = None
+    if version != us.snapshot_version:
+        planner = us.planner
+        us.snapshot_version = version
+    task = asyncio.create_task(_persist_snapshot(username, planner, _copy_plan(us.current_plan)))
+    _snapshot_tasks.add(task)
+    task.add_done_callback(_snapshot_tasks.discard)
+
+
+def _sweep_sessions() -> None:
+    _user_sessions.sweep()
+    # Zutaten-Facets vor Ablauf erneuern, damit die Autovervollständigung nie auf das Proben wartet
+    try:
+        refresh_ingredient_facets([us.planner for us in _user_sessions.values()],
+                                  ahead=2 * SESSION_SWEEP_INTERVAL)
+    except Exception as e:
+        log.warning(f"Facet-Erneuerung fehlgeschlagen: {e}")
+    _loop.call_later(SESSION_SWEEP_INTERVAL, _sweep_sessions)
+
+
+_loop.call_soon_threadsafe(_sweep_sessions)
 
 
 # Datenbank initialisieren
 init_db()
+init_catalog()
+
 
+def run_async(coro, timeout: float = 120):
+    """Async-Coroutine im persistenten Event-Loop ausführen und blockierend warten.
 
-def run_async(coro):
-    """Async-Coroutine im persistenten Event-Loop ausführen."""
+    Nur für Start und Sync-Code; Cookidoo-Routen laufen über `asgi_app` und
+    belegen während der Arbeit keinen Thread.
+    """
     future = asyncio.run_coroutine_threadsafe(coro, _loop)
-    return future.result(timeout=120)
+    return future.result(timeout=timeout)
+
+
+# Lokalisierungstabelle einmal beim Start laden (sonst beim ersten Login)
+try:
+    run_async(load_localizations())
+except Exception as e:
+    log.warning(f"Lokalisierungen laden fehlgeschlagen: {e}")
 
 
 def cookidoo_route(f):
     """Decorator: Route nur für eingeloggte Nicht-Admin User."""
-    from functools import wraps
     @wraps(f)
     def decorated(*args, **kwargs):
         if "user" not in session:
@@ -76,6 +273,34 @@ def cookidoo_route(f):
     return decorated
 
 
+async def _cookidoo_guard(username: str | None) -> tuple[dict, int] | None:
+    """Wie cookidoo_route, für die async Routen."""
+    if username is None:
+        return {"error": "Nicht angemeldet"}, 401
+    if await asyncio.to_thread(is_admin, username):
+        return {"error": "Admin kann Cookidoo nicht nutzen"}, 403
+    return None
+
+
+# ASGI-Einstieg (uvicorn app:asgi_app): Cookidoo-Routen async, Rest über Flask
+asgi_app = AsyncRoutes(app, loop=_loop, guard=_cookidoo_guard)
+
+
+def in_flight(handler):
+    """Decorator für async Cookidoo-Routen: solange der Request läuft, wird die
+    Session des Users nicht verdrängt (Planner bleibt offen, Plan bleibt registriert)."""
+    @wraps(handler)
+    async def decorated(req: ApiRequest) -> tuple[dict, int]:
+        _requests_in_flight[req.user] = _requests_in_flight.get(req.user, 0) + 1
+        try:
+            return await handler(req)
+        finally:
+            remaining = _requests_in_flight.pop(req.user) - 1
+            if remaining:
+                _requests_in_flight[req.user] = remaining
+    return decorated
+
+
 # ===== Auth-Routen =====
 
 @app.route("/")
@@ -124,12 +349,8 @@ def api_auth_register():
 def api_auth_logout():
     username = session.pop("user", None)
     # User-Session aufräumen
-    if username and username in _user_sessions:
-        us = _user_sessions.pop(username)
-        try:
-            run_async(us.planner.close())
-        except Exception:
-            pass
+    if username:
+        _user_sessions.remove(username)
     return jsonify({"success": True})
 
 
@@ -149,15 +370,33 @@ def api_admin_users():
     return jsonify({"success": True, "users": users})
 
 
+@app.route("/api/admin/stats", methods=["GET"])
+@admin_required
+def api_admin_stats():
+    return jsonify({
+        "success": True,
+        "algolia_cache": algolia_cache.stats(),
+        "recipe_details_cache": recipe_details_cache.stats(),
+        "algolia_pool": algolia_pool.stats(),
+        "algolia_flight": algolia_flight.stats(),
+        "cookidoo_flight": cookidoo_flight.stats(),
+        "algolia_keys": algolia_keys.stats(),
+        "ingredient_facets": ingredient_facets.stats(),
+        "save_jobs": save_jobs.stats(),
+        "user_sessions": _user_sessions.stats(),
+        "requests_in_flight": sum(_requests_in_flight.values()),
+        "ingredient_index": {lang: index.stats() for lang, index in ingredient_indexes.items()},
+    })
+
+
 @app.route("/api/admin/users/<int:user_id>", methods=["DELETE"])
 @admin_required
 def api_admin_delete_user(user_id):
     try:
-        delete_user(user_id)
+        username = delete_user(user_id)
         # Aktive Session des gelöschten Users aufräumen
-        for username, us in list(_user_sessions.items()):
-            # Wir räumen alle auf, die nicht mehr existieren
-            pass
+        _user_sessions.remove(username)
+        delete_session_snapshot(username)
         return jsonify({"success": True})
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -194,98 +433,127 @@ def api_admin_delete_invite(code):
 
 # ===== Cookidoo-Routen =====
 
-@app.route("/api/login", methods=["POST"])
-@cookidoo_route
-def api_login():
-    data = request.get_json()
+async def _login(username: str, email: str, password: str, country: str, language: str) -> tuple[dict, int]:
+    us = get_user_session(username)
+    try:
+        result = await us.planner.login(email, password, country, language,
+                                        on_tokens=_token_saver(username, email))
+        _rehydrate_failures.pop(username, None)
+        return {"success": True, **result}, 200
+    except Exception as e:
+        return {"error": f"Login fehlgeschlagen: {e}"}, 401
+
+
+@asgi_app.route("/api/login", methods=["POST"])
+@in_flight
+async def api_login(req: ApiRequest) -> tuple[dict, int]:
+    data = req.data
     email = data.get("email", "")
     password = data.get("password", "")
     country = data.get("country", "de")
     language = data.get("language", "de-DE")
 
     if not email or not password:
-        return jsonify({"error": "E-Mail und Passwort erforderlich"}), 400
+        return {"error": "E-Mail und Passwort erforderlich"}, 400
 
-    us = get_user_session(session["user"])
+    return await _login(req.user, email, password, country, language)
 
-    try:
-        result = run_async(us.planner.login(email, password, country, language))
-        return jsonify({"success": True, **result})
-    except Exception as e:
-        return jsonify({"error": f"Login fehlgeschlagen: {e}"}), 401
 
+async def _resume(username: str) -> tuple[dict, int]:
+    if await asyncio.to_thread(get_cookidoo_credentials, username) is None:
+        return {"success": False, "has_credentials": False}, 200
+    us = await get_ready_session(username)
+    return {"success": us is not None, "has_credentials": True}, 200
 
-@app.route("/api/collections", methods=["POST"])
-@cookidoo_route
-def api_load_collections():
-    us = get_user_session(session["user"])
+
+@asgi_app.route("/api/resume", methods=["POST"])
+@in_flight
+async def api_resume(req: ApiRequest) -> tuple[dict, int]:
+    """Laufende oder wiederhergestellte Session nutzen statt Login + Sammlungen laden."""
+    return await _resume(req.user)
+
+
+async def _load_collections(username: str) -> tuple[dict, int]:
+    us = get_user_session(username)
+    rehydrated = await _rehydrate_if_needed(username, us)
+    if not us.planner.is_logged_in:
+        return _session_unavailable()
     try:
-        result = run_async(us.planner.load_collections())
-        log.info(f"[{session['user']}] Collections geladen: {result}")
-        return jsonify({"success": True, **result})
+        # Hat die Wiederherstellung die Sammlungen gerade geladen, nicht nochmal laden
+        if rehydrated and rehydrated["collections"] is not None:
+            result = rehydrated["collections"]
+        else:
+            result = await us.planner.load_collections()
+        log.info(f"[{username}] Collections geladen: {result}")
+        persist_snapshot(username, us)
+        return {"success": True, **result}, 200
     except Exception as e:
         import traceback
         traceback.print_exc()
-        return jsonify({"error": f"Sammlungen laden fehlgeschlagen: {e}"}), 500
+        return {"error": f"Sammlungen laden fehlgeschlagen: {e}"}, 500
 
 
-@app.route("/api/generate", methods=["POST"])
-@cookidoo_route
-def api_generate():
-    us = get_user_session(session["user"])
-    data = request.get_json() or {}
-    # day_slots: {dayIdx: ["m","a","m_v","m_d","a_v","a_d"]}
-    day_slots_raw = data.get("day_slots", {str(i): ["m"] for i in range(7)})
-    day_slots = {int(k): v for k, v in day_slots_raw.items()}
-    custom_ratio = data.get("custom_ratio", 70)
-    exclude_ids = data.get("exclude_ids", [])
-    categories = data.get("categories", [])
-    cuisines = data.get("cuisines", [])
-    languages = data.get("languages", [])
-    preferred_ingredients = data.get("preferred_ingredients", [])
-    exclude_ingredients = data.get("exclude_ingredients", [])
-    max_time_per_slot = data.get("max_time_per_slot", {"m": None, "a": None})
+@asgi_app.route("/api/collections", methods=["POST"])
+@in_flight
+async def api_load_collections(req: ApiRequest) -> tuple[dict, int]:
+    return await _load_collections(req.user)
+
 
+async def _generate(username: str, day_slots: dict, custom_ratio: int, exclude_ids: list,
+                    max_time_per_slot: dict, exclude_ingredients: list, filters: tuple) -> tuple[dict, int]:
+    us = await get_ready_session(username)
+    if us is None:
+        return _session_unavailable()
+    categories, cuisines, preferred_ingredients, languages = filters
     try:
         if categories or cuisines or preferred_ingredients or languages:
-            run_async(us.planner.search_with_filters(categories, cuisines, preferred_ingredients, languages))
+            await us.planner.search_with_filters(categories, cuisines, preferred_ingredients, languages)
 
-        plan = run_async(us.planner.generate_plan(
+        plan = await us.planner.generate_plan(
             day_slots, custom_ratio, exclude_ids, max_time_per_slot, exclude_ingredients, languages
-        ))
+        )
         us.current_plan = {}
         for day_name, slots in plan.items():
             us.current_plan[day_name] = {sk: r.to_dict() if r else None for sk, r in slots.items()}
 
-        log.info(f"[{session['user']}] Plan: {list(us.current_plan.keys())}")
-        return jsonify({"success": True, "plan": us.current_plan})
+        log.info(f"[{username}] Plan: {list(us.current_plan.keys())}")
+        persist_snapshot(username, us)
+        return {"success": True, "plan": _copy_plan(us.current_plan)}, 200
     except Exception as e:
         import traceback
         traceback.print_exc()
-        return jsonify({"error": f"Plan generieren fehlgeschlagen: {e}"}), 500
+        return {"error": f"Plan generieren fehlgeschlagen: {e}"}, 500
 
 
-@app.route("/api/regenerate-day", methods=["POST"])
-@cookidoo_route
-def api_regenerate_day():
-    us = get_user_session(session["user"])
-    data = request.get_json() or {}
-    day_name = data.get("day")
-    slot_key = data.get("slot_key", "m")  # "m", "a", "m_v", "m_d", "a_v", "a_d"
+@asgi_app.route("/api/generate", methods=["POST"])
+@in_flight
+async def api_generate(req: ApiRequest) -> tuple[dict, int]:
+    data = req.data
+    # day_slots: {dayIdx: ["m","a","m_v","m_d","a_v","a_d"]}
+    day_slots_raw = data.get("day_slots", {str(i): ["m"] for i in range(7)})
+    day_slots = {int(k): v for k, v in day_slots_raw.items()}
     custom_ratio = data.get("custom_ratio", 70)
-    max_time_minutes = data.get("max_time_minutes")
+    exclude_ids = data.get("exclude_ids", [])
     categories = data.get("categories", [])
     cuisines = data.get("cuisines", [])
     languages = data.get("languages", [])
     preferred_ingredients = data.get("preferred_ingredients", [])
     exclude_ingredients = data.get("exclude_ingredients", [])
-    # Per-day override (optional)
-    override_category = data.get("override_category", "")
-    override_cuisine = data.get("override_cuisine", "")
+    max_time_per_slot = data.get("max_time_per_slot", {"m": None, "a": None})
+
+    return await _generate(
+        req.user, day_slots, custom_ratio, exclude_ids, max_time_per_slot, exclude_ingredients,
+        (categories, cuisines, preferred_ingredients, languages),
+    )
 
-    # Effektive Kategorie/Küche bestimmen
-    eff_categories = [override_category] if override_category else categories
-    eff_cuisines = [override_cuisine] if override_cuisine else cuisines
+
+async def _regenerate_day(username: str, day_name: str, slot_key: str, custom_ratio: int,
+                          max_time_minutes: int | None, exclude_ingredients: list,
+                          filters: tuple) -> tuple[dict, int]:
+    us = await get_ready_session(username)
+    if us is None:
+        return _session_unavailable()
+    categories, cuisines, preferred_ingredients, languages = filters
 
     # Slot-Typ bestimmen
     slot_type = "starter" if "_v" in slot_key else "dessert" if "_d" in slot_key else "main"
@@ -298,46 +566,95 @@ def api_regenerate_day():
                 exclude_ids.append(r["id"])
 
     try:
-        if eff_categories or eff_cuisines or preferred_ingredients or languages:
-            run_async(us.planner.search_with_filters(eff_categories, eff_cuisines, preferred_ingredients, languages))
+        if categories or cuisines or preferred_ingredients or languages:
+            await us.planner.search_with_filters(categories, cuisines, preferred_ingredients, languages)
 
-        recipe = run_async(us.planner.generate_single(
+        recipe = await us.planner.generate_single(
             custom_ratio, exclude_ids, max_time_minutes, slot_type, exclude_ingredients, languages
-        ))
+        )
 
         if day_name not in us.current_plan:
             us.current_plan[day_name] = {}
 
         if recipe:
             us.current_plan[day_name][slot_key] = recipe.to_dict()
+        persist_snapshot(username, us)
 
-        return jsonify({"success": True, "recipe": us.current_plan[day_name].get(slot_key)})
+        return {"success": True, "recipe": us.current_plan[day_name].get(slot_key)}, 200
     except Exception as e:
-        return jsonify({"error": f"Rezept generieren fehlgeschlagen: {e}"}), 500
+        return {"error": f"Rezept generieren fehlgeschlagen: {e}"}, 500
 
 
-@app.route("/api/save", methods=["POST"])
-@cookidoo_route
-def api_save():
-    us = get_user_session(session["user"])
-    data = request.get_json() or {}
-    week_offset = data.get("week_offset", 0)
-    clear_first = data.get("clear_first", False)
+@asgi_app.route("/api/regenerate-day", methods=["POST"])
+@in_flight
+async def api_regenerate_day(req: ApiRequest) -> tuple[dict, int]:
+    data = req.data
+    day_name = data.get("day")
+    slot_key = data.get("slot_key", "m")  # "m", "a", "m_v", "m_d", "a_v", "a_d"
+    custom_ratio = data.get("custom_ratio", 70)
+    max_time_minutes = data.get("max_time_minutes")
+    categories = data.get("categories", [])
+    cuisines = data.get("cuisines", [])
+    languages = data.get("languages", [])
+    preferred_ingredients = data.get("preferred_ingredients", [])
+    exclude_ingredients = data.get("exclude_ingredients", [])
+    # Per-day override (optional)
+    override_category = data.get("override_category", "")
+    override_cuisine = data.get("override_cuisine", "")
 
+    # Effektive Kategorie/Küche bestimmen
+    eff_categories = [override_category] if override_category else categories
+    eff_cuisines = [override_cuisine] if override_cuisine else cuisines
+
+    return await _regenerate_day(
+        req.user, day_name, slot_key, custom_ratio, max_time_minutes, exclude_ingredients,
+        (eff_categories, eff_cuisines, preferred_ingredients, languages),
+    )
+
+
+async def _submit_save(username: str, week_offset: int, clear_first: bool,
+                       add_to_shopping_list: bool) -> tuple[dict, int]:
+    us = await get_ready_session(username)
+    if us is None:
+        return _session_unavailable()
     if not us.current_plan:
-        return jsonify({"error": "Kein Plan vorhanden"}), 400
+        return {"error": "Kein Plan vorhanden"}, 400
 
+    # Plan-Stand zum Zeitpunkt des Speicherns; spätere Rerolls ändern den Job nicht
+    plan = _copy_plan(us.current_plan)
+
+    async def work(job: Job) -> dict:
+        try:
+            if clear_first:
+                # Woche ersetzen: nur die Differenz zum Kalender schreiben statt leeren + neu anlegen
+                return await us.planner.sync_calendar_week(plan, week_offset, add_to_shopping_list, job.progress)
+            return await us.planner.save_to_calendar(plan, week_offset, add_to_shopping_list, job.progress)
+        except Exception as e:
+            raise RuntimeError(f"Speichern fehlgeschlagen: {e}") from e
+
+    # Läuft im Hintergrund weiter; Status über /api/jobs/<job_id>
+    job = save_jobs.submit(username, "save", work)
+    return {"success": True, "job_id": job.id, "status": job.status}, 202
+
+
+@asgi_app.route("/api/save", methods=["POST"])
+@in_flight
+async def api_save(req: ApiRequest) -> tuple[dict, int]:
+    data = req.data
+    week_offset = data.get("week_offset", 0)
+    clear_first = data.get("clear_first", False)
     add_to_shopping_list = data.get("add_to_shopping_list", False)
 
-    try:
-        if clear_first:
-            run_async(us.planner.clear_calendar_week(week_offset))
+    return await _submit_save(req.user, week_offset, clear_first, add_to_shopping_list)
 
-        result = run_async(us.planner.save_to_calendar(us.current_plan, week_offset, add_to_shopping_list))
 
-        return jsonify({"success": True, **result})
-    except Exception as e:
-        return jsonify({"error": f"Speichern fehlgeschlagen: {e}"}), 500
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+@cookidoo_route
+def api_job_status(job_id):
+    job = save_jobs.get(job_id, session["user"])
+    if not job:
+        return jsonify({"error": "Job nicht gefunden"}), 404
+    return jsonify({"success": True, "job": job.to_dict()})
 
 
 # ===== Filter (serverseitig gespeichert pro User) =====
@@ -381,33 +698,44 @@ def api_save_cookidoo_credentials():
     if not email or not password:
         return jsonify({"error": "E-Mail und Passwort erforderlich"}), 400
     save_cookidoo_credentials(session["user"], email, password, country, language)
+    # Neue Zugangsdaten: Wiederherstellung sofort wieder zulassen
+    _rehydrate_failures.pop(session["user"], None)
     return jsonify({"success": True})
 
 
-@app.route("/api/ingredient-suggestions", methods=["GET"])
-@cookidoo_route
-def api_ingredient_suggestions():
-    query = request.args.get("q", "").strip()
-    if len(query) < 2:
-        return jsonify({"count": 0, "suggestions": []})
-    us = get_user_session(session["user"])
+async def _ingredient_suggestions(username: str, query: str) -> tuple[dict, int]:
+    us = await get_ready_session(username)
+    if us is None:
+        return _session_unavailable()
     try:
-        result = run_async(us.planner.ingredient_suggestions(query))
-        log.debug(f"[{session['user']}] ingredient_suggestions '{query}': {result}")
-        return jsonify(result)
+        result = await us.planner.ingredient_suggestions(query)
+        log.debug(f"[{username}] ingredient_suggestions '{query}': {result}")
+        return result, 200
     except Exception as e:
-        log.warning(f"[{session['user']}] ingredient_suggestions Fehler: {e}")
-        return jsonify({"count": 0, "suggestions": []})
+        log.warning(f"[{username}] ingredient_suggestions Fehler: {e}")
+        return {"count": 0, "suggestions": []}, 200
+
+
+@asgi_app.route("/api/ingredient-suggestions", methods=["GET"])
+@in_flight
+async def api_ingredient_suggestions(req: ApiRequest) -> tuple[dict, int]:
+    query = req.args.get("q", "").strip()
+    if len(query) < 2:
+        return {"count": 0, "suggestions": []}, 200
+    return await _ingredient_suggestions(req.user, query)
 
 
 @app.route("/api/cookidoo-credentials", methods=["DELETE"])
 @cookidoo_route
 def api_clear_cookidoo_credentials():
     clear_cookidoo_credentials(session["user"])
+    delete_session_snapshot(session["user"])
     return jsonify({"success": True})
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     port = int(os.getenv("PORT", 5000))
     debug = os.getenv("FLY_APP_NAME") is None
-    app.run(debug=debug, host="0.0.0.0", port=port, use_reloader=False)
+    uvicorn.run(asgi_app, host="0.0.0.0", port=port, log_level="debug" if debug else "info")
@@ -0,0 +1,130 @@
+"""ASGI-Einstieg: async Routen auf dem Cookidoo-Loop, alle übrigen Routen über Flask.
+
+Eine async Route belegt während der Cookidoo-/Algolia-Arbeit keinen Thread: der
+Server-Loop wartet nur auf das Future des Cookidoo-Loops. Flask-Routen laufen
+weiter als WSGI in einem kleinen Thread-Pool.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+from flask import Flask
+from itsdangerous import BadSignature
+from werkzeug.http import parse_cookie
+
+log = logging.getLogger("cookidoo")
+
+# Threads für die (kurzen) Flask-Routen; Cookidoo-Routen brauchen keinen
+WSGI_THREADS = int(os.getenv("WSGI_THREADS", 8))
+
+
+@dataclass
+class ApiRequest:
+    user: str | None
+    data: dict = field(default_factory=dict)
+    args: dict[str, str] = field(default_factory=dict)
+
+
+Handler = Callable[[ApiRequest], Awaitable[tuple[dict, int]]]
+Guard = Callable[[str | None], Awaitable[tuple[dict, int] | None]]
+
+
+class AsyncRoutes:
+    """ASGI-App: registrierte Routen async auf `loop`, alles andere an die Flask-App.
+
+    `guard` prüft den Session-User vor jeder async Route und liefert eine
+    Fehlerantwort oder None. Handler geben (Body, Status) zurück.
+    """
+
+    def __init__(self, flask_app: Flask, loop: asyncio.AbstractEventLoop, guard: Guard | None = None,
+                 threads: int = WSGI_THREADS, timeout: float = 120):
+        self.flask_app = flask_app
+        self.loop = loop
+        self.guard = guard
+        self.timeout = timeout
+        self._wsgi = WSGIMiddleware(flask_app, workers=threads)
+        self._routes: dict[tuple[str, str], Handler] = {}
+
+    def route(self, path: str, methods: list[str]):
+        def register(handler: Handler) -> Handler:
+            for method in methods:
+                self._routes[(method, path)] = handler
+            return handler
+        return register
+
+    async def __call__(self, scope, receive, send) -> None:
+        handler = self._routes.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if handler is None:
+            await self._wsgi(scope, receive, send)
+            return
+        body, status = await self._handle(handler, scope, receive)
+        payload = self.flask_app.json.dumps(body).encode() + b"\n"
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(payload)).encode())],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+    async def _handle(self, handler: Handler, scope, receive) -> tuple[dict, int]:
+        user = self._session_user(scope)
+        if self.guard:
+            denied = await self.guard(user)
+            if denied:
+                return denied
+        req = ApiRequest(
+            user=user,
+            data=_parse_json(await _read_body(receive)),
+            args={k: v[0] for k, v in parse_qs(scope.get("query_string", b"").decode("latin-1")).items()},
+        )
+        # Handler läuft auf dem Cookidoo-Loop; hier wird nur auf das Ergebnis gewartet
+        future = asyncio.run_coroutine_threadsafe(handler(req), self.loop)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"[{user}] {scope['path']}: Zeitüberschreitung nach {self.timeout:.0f}s")
+            return {"error": "Zeitüberschreitung"}, 504
+        except Exception as e:
+            log.exception(f"[{user}] {scope['path']} fehlgeschlagen: {e}")
+            return {"error": "Interner Fehler"}, 500
+
+    def _session_user(self, scope) -> str | None:
+        """User aus dem signierten Flask-Session-Cookie (wie session.get("user"))."""
+        header = "; ".join(v.decode("latin-1") for k, v in scope.get("headers", []) if k == b"cookie")
+        interface = self.flask_app.session_interface
+        value = parse_cookie(header).get(interface.get_cookie_name(self.flask_app))
+        serializer = interface.get_signing_serializer(self.flask_app)
+        if not value or serializer is None:
+            return None
+        max_age = int(self.flask_app.permanent_session_lifetime.total_seconds())
+        try:
+            return serializer.loads(value, max_age=max_age).get("user")
+        except BadSignature:
+            return None
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return body
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+def _parse_json(body: bytes) -> dict:
+    # Wie `request.get_json() or {}`: leerer oder ungültiger Body ergibt {}
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
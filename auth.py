@@ -5,6 +5,7 @@ import hashlib
 import json
 import os
 import sqlite3
+import threading
 import uuid
 from datetime import datetime
 from functools import wraps
@@ -17,9 +18,30 @@ DATA_DIR = Path(os.getenv("DATA_DIR", Path(__file__).parent))
 DB_PATH = DATA_DIR / "users.db"
 
 
+# Anzahl vorbereiteter Statements, die jede Verbindung wiederverwendet
+DB_STATEMENT_CACHE = 64
+
+# Eine Verbindung pro Thread (WSGI-Threads, asyncio.to_thread-Worker)
+_local = threading.local()
+
+
 def _get_db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Verbindung des aktuellen Threads holen, beim ersten Zugriff öffnen.
+
+    WAL erlaubt Lesen parallel zu einem Schreiber; synchronous=NORMAL reicht
+    im WAL-Modus für Konsistenz. Verbindungen bleiben offen, damit der
+    Statement-Cache greift – Funktionen schliessen sie daher nicht.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, timeout=10, cached_statements=DB_STATEMENT_CACHE)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+    elif conn.in_transaction:
+        # Von einer Exception offen gelassene Transaktion nicht weiterverwenden
+        conn.rollback()
     return conn
 
 
@@ -63,7 +85,8 @@ def init_db():
     columns = [row["name"] for row in conn.execute("PRAGMA table_info(users)").fetchall()]
     if "is_admin" not in columns:
         conn.execute("ALTER TABLE users ADD COLUMN is_admin BOOLEAN NOT NULL DEFAULT 0")
-    for col in ["cookidoo_email", "cookidoo_password_enc", "cookidoo_country", "cookidoo_language", "filters_json"]:
+    for col in ["cookidoo_email", "cookidoo_password_enc", "cookidoo_country", "cookidoo_language", "filters_json",
+                "cookidoo_tokens_enc"]:
         if col not in columns:
             conn.execute(f"ALTER TABLE users ADD COLUMN {col} TEXT")
     conn.commit()
@@ -86,8 +109,6 @@ def init_db():
     else:
         print("\nWARNUNG: ADMIN_PASSWORD nicht gesetzt - kein Admin-Account erstellt\n")
 
-    conn.close()
-
 
 def _generate_code() -> str:
     return uuid.uuid4().hex[:8].upper()
@@ -99,7 +120,6 @@ def is_admin(username: str) -> bool:
     user = conn.execute(
         "SELECT is_admin FROM users WHERE username = ?", (username,)
     ).fetchone()
-    conn.close()
     return bool(user and user["is_admin"])
 
 
@@ -123,7 +143,6 @@ def register_user(username: str, password: str, invite_code: str) -> dict:
     ).fetchone()
 
     if not code_row:
-        conn.close()
         raise ValueError("Ungültiger oder bereits verwendeter Einladungscode")
 
     # User existiert bereits?
@@ -131,24 +150,20 @@ def register_user(username: str, password: str, invite_code: str) -> dict:
         "SELECT id FROM users WHERE username = ?", (username,)
     ).fetchone()
     if existing:
-        conn.close()
         raise ValueError("Benutzername bereits vergeben")
 
-    # User erstellen (is_admin=0)
+    # User erstellen (is_admin=0) und Code als verwendet markieren – beides
+    # oder nichts, damit die Verbindung keine halbe Transaktion behält
     password_hash = generate_password_hash(password)
-    conn.execute(
-        "INSERT INTO users (username, password_hash, is_admin, created_at) VALUES (?, ?, 0, ?)",
-        (username, password_hash, datetime.now().isoformat()),
-    )
-
-    # Code als verwendet markieren
-    conn.execute(
-        "UPDATE invite_codes SET used_by = ? WHERE code = ?",
-        (username, invite_code.strip().upper()),
-    )
-
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(
+            "INSERT INTO users (username, password_hash, is_admin, created_at) VALUES (?, ?, 0, ?)",
+            (username, password_hash, datetime.now().isoformat()),
+        )
+        conn.execute(
+            "UPDATE invite_codes SET used_by = ? WHERE code = ?",
+            (username, invite_code.strip().upper()),
+        )
 
     return {"username": username, "is_admin": False}
 
@@ -162,7 +177,6 @@ def verify_user(username: str, password: str) -> dict:
     user = conn.execute(
         "SELECT * FROM users WHERE username = ?", (username,)
     ).fetchone()
-    conn.close()
 
     if not user or not check_password_hash(user["password_hash"], password):
         raise ValueError("Ungültiger Benutzername oder Passwort")
@@ -176,23 +190,20 @@ def get_all_users() -> list[dict]:
     rows = conn.execute(
         "SELECT id, username, is_admin, created_at FROM users ORDER BY created_at"
     ).fetchall()
-    conn.close()
     return [dict(row) for row in rows]
 
 
-def delete_user(user_id: int) -> None:
-    """User löschen (nicht den Admin)."""
+def delete_user(user_id: int) -> str:
+    """User löschen (nicht den Admin), gibt den Benutzernamen zurück."""
     conn = _get_db()
     user = conn.execute("SELECT username, is_admin FROM users WHERE id = ?", (user_id,)).fetchone()
     if not user:
-        conn.close()
         raise ValueError("Benutzer nicht gefunden")
     if user["is_admin"]:
-        conn.close()
         raise ValueError("Admin-Account kann nicht gelöscht werden")
     conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
     conn.commit()
-    conn.close()
+    return user["username"]
 
 
 def reset_user_password(user_id: int, new_password: str) -> None:
@@ -202,14 +213,12 @@ def reset_user_password(user_id: int, new_password: str) -> None:
     conn = _get_db()
     user = conn.execute("SELECT id FROM users WHERE id = ?", (user_id,)).fetchone()
     if not user:
-        conn.close()
         raise ValueError("Benutzer nicht gefunden")
     conn.execute(
         "UPDATE users SET password_hash = ? WHERE id = ?",
         (generate_password_hash(new_password), user_id),
     )
     conn.commit()
-    conn.close()
 
 
 def get_invite_codes() -> list[dict]:
@@ -218,7 +227,6 @@ def get_invite_codes() -> list[dict]:
     rows = conn.execute(
         "SELECT code, created_by, used_by, created_at FROM invite_codes ORDER BY created_at DESC"
     ).fetchall()
-    conn.close()
     return [dict(row) for row in rows]
 
 
@@ -227,11 +235,9 @@ def delete_invite_code(code: str) -> None:
     conn = _get_db()
     row = conn.execute("SELECT code FROM invite_codes WHERE code = ?", (code,)).fetchone()
     if not row:
-        conn.close()
         raise ValueError("Code nicht gefunden")
     conn.execute("DELETE FROM invite_codes WHERE code = ?", (code,))
     conn.commit()
-    conn.close()
 
 
 def save_cookidoo_credentials(username: str, email: str, password: str, country: str, language: str) -> None:
@@ -242,7 +248,6 @@ def save_cookidoo_credentials(username: str, email: str, password: str, country:
         (email, _xor_encrypt(password), country, language, username),
     )
     conn.commit()
-    conn.close()
 
 
 def get_cookidoo_credentials(username: str) -> dict | None:
@@ -252,7 +257,6 @@ def get_cookidoo_credentials(username: str) -> dict | None:
         "SELECT cookidoo_email, cookidoo_password_enc, cookidoo_country, cookidoo_language FROM users WHERE username=?",
         (username,),
     ).fetchone()
-    conn.close()
     if not row or not row["cookidoo_email"]:
         return None
     try:
@@ -266,6 +270,33 @@ def get_cookidoo_credentials(username: str) -> dict | None:
         return None
 
 
+def save_cookidoo_tokens(username: str, email: str, tokens: dict) -> None:
+    """Cookidoo-OAuth-Tokens verschlüsselt speichern (gehören zum Konto `email`)."""
+    conn = _get_db()
+    conn.execute(
+        "UPDATE users SET cookidoo_tokens_enc = ? WHERE username = ?",
+        (_xor_encrypt(json.dumps({"email": email, **tokens})), username),
+    )
+    conn.commit()
+
+
+def get_cookidoo_tokens(username: str, email: str) -> dict | None:
+    """Gespeicherte Tokens holen – nur wenn sie zum Cookidoo-Konto `email` gehören."""
+    conn = _get_db()
+    row = conn.execute(
+        "SELECT cookidoo_tokens_enc FROM users WHERE username = ?", (username,)
+    ).fetchone()
+    if not row or not row["cookidoo_tokens_enc"]:
+        return None
+    try:
+        tokens = json.loads(_xor_decrypt(row["cookidoo_tokens_enc"]))
+    except Exception:
+        return None
+    if tokens.pop("email", None) != email:
+        return None
+    return tokens
+
+
 def save_user_filters(username: str, filters: dict) -> None:
     """Filter-Einstellungen eines Users speichern."""
     conn = _get_db()
@@ -274,7 +305,6 @@ def save_user_filters(username: str, filters: dict) -> None:
         (json.dumps(filters), username),
     )
     conn.commit()
-    conn.close()
 
 
 def get_user_filters(username: str) -> dict | None:
@@ -283,7 +313,6 @@ def get_user_filters(username: str) -> dict | None:
     row = conn.execute(
         "SELECT filters_json FROM users WHERE username = ?", (username,)
     ).fetchone()
-    conn.close()
     if not row or not row["filters_json"]:
         return None
     try:
@@ -296,11 +325,11 @@ def clear_cookidoo_credentials(username: str) -> None:
     """Gespeicherte Cookidoo-Zugangsdaten löschen."""
     conn = _get_db()
     conn.execute(
-        "UPDATE users SET cookidoo_email=NULL, cookidoo_password_enc=NULL, cookidoo_country=NULL, cookidoo_language=NULL WHERE username=?",
+        "UPDATE users SET cookidoo_email=NULL, cookidoo_password_enc=NULL, cookidoo_country=NULL, "
+        "cookidoo_language=NULL, cookidoo_tokens_enc=NULL WHERE username=?",
         (username,),
     )
     conn.commit()
-    conn.close()
 
 
 def create_invite_code(created_by: str) -> str:
@@ -312,7 +341,6 @@ def create_invite_code(created_by: str) -> str:
         (code, created_by, datetime.now().isoformat()),
     )
     conn.commit()
-    conn.close()
     return code
 
 
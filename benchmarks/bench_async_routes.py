@@ -0,0 +1,100 @@
+"""Lastbenchmark: blockierende Flask-Route vs. async Route bei gleicher Thread-Anzahl.
+
+Simuliert Cookidoo-/Algolia-Latenz mit asyncio.sleep. Beide Routen laufen im
+selben uvicorn-Server hinter `AsyncRoutes` mit `--threads` WSGI-Threads:
+
+- "blocking": Flask-View mit run_async, belegt einen Thread pro Request
+  (wie zuvor unter Gunicorn mit --threads),
+- "async": registrierte async Route, wartet ohne Thread auf den Cookidoo-Loop.
+
+    python benchmarks/bench_async_routes.py --requests 400 --concurrency 64 --threads 4 16
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp())
+os.environ.setdefault("LOG_FILE", os.path.join(os.environ["DATA_DIR"], "bench.log"))
+
+import aiohttp  # noqa: E402
+import uvicorn  # noqa: E402
+from flask import jsonify  # noqa: E402
+
+import app as webapp  # noqa: E402
+from asgi import ApiRequest, AsyncRoutes  # noqa: E402
+
+LATENCY = 0.2
+
+
+async def two_upstream_calls() -> dict:
+    await asyncio.sleep(LATENCY)
+    await asyncio.sleep(LATENCY)
+    return {"success": True}
+
+
+@webapp.app.route("/bench/blocking")
+def bench_blocking():
+    return jsonify(webapp.run_async(two_upstream_calls()))
+
+
+async def bench_async(req: ApiRequest) -> tuple[dict, int]:
+    return await two_upstream_calls(), 200
+
+
+def start_server(threads: int) -> tuple[uvicorn.Server, int]:
+    routes = AsyncRoutes(webapp.app, loop=webapp._loop, threads=threads)
+    routes.route("/bench/async", methods=["GET"])(bench_async)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(routes, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, port
+
+
+async def run(url: str, n_requests: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as client:
+        async def one():
+            async with sem, client.get(url) as resp:
+                assert resp.status == 200, resp.status
+                await resp.read()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n_requests)))
+        return n_requests / (time.perf_counter() - start)
+
+
+def main():
+    global LATENCY
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=LATENCY)
+    parser.add_argument("--threads", type=int, nargs="+", default=[4, 16])
+    args = parser.parse_args()
+    LATENCY = args.latency
+
+    print(f"{args.requests} Requests, {args.concurrency} parallel, "
+          f"2 Upstream-Aufrufe à {LATENCY * 1000:.0f} ms pro Request")
+    for threads in args.threads:
+        server, port = start_server(threads)
+        for name in ("blocking", "async"):
+            rps = asyncio.run(run(f"http://127.0.0.1:{port}/bench/{name}", args.requests, args.concurrency))
+            print(f"  {name:<9} threads={threads:<3} {rps:8.1f} req/s")
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Durchsatz von /api/auth/status: neue SQLite-Verbindung pro Aufruf vs. Verbindung pro Thread.
+
+Jeder Request eines eingeloggten Users fragt `is_admin` ab. "legacy" ist das
+frühere `is_admin`: Verbindung öffnen, abfragen, schliessen, auf einer eigenen
+frischen DB im Rollback-Journal-Modus (DELETE). "pooled" ist das heutige
+`is_admin` mit der Verbindung des Threads auf der WAL-DB aus DATA_DIR.
+
+    python benchmarks/bench_auth_status.py --requests 5000 --threads 1 16
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp())
+os.environ.setdefault("LOG_FILE", os.path.join(os.environ["DATA_DIR"], "bench.log"))
+
+import app as webapp  # noqa: E402
+import auth  # noqa: E402
+
+USERNAME = "bench"
+
+LEGACY_DB_PATH = Path(tempfile.mkdtemp()) / "users.db"
+
+
+def legacy_is_admin(username: str) -> bool:
+    # Früheres auth.is_admin: Verbindung pro Aufruf, danach schliessen
+    conn = sqlite3.connect(LEGACY_DB_PATH)
+    conn.row_factory = sqlite3.Row
+    user = conn.execute(
+        "SELECT is_admin FROM users WHERE username = ?", (username,)
+    ).fetchone()
+    conn.close()
+    return bool(user and user["is_admin"])
+
+
+pooled_is_admin = webapp.is_admin
+
+INSERT_USER = "INSERT OR IGNORE INTO users (username, password_hash, is_admin, created_at) VALUES (?, 'x', 0, 'bench')"
+
+
+def setup_users() -> None:
+    conn = auth._get_db()
+    conn.execute(INSERT_USER, (USERNAME,))
+    conn.commit()
+
+    # Frische Legacy-DB mit gleichem Schema, ohne WAL
+    conn = sqlite3.connect(LEGACY_DB_PATH)
+    assert conn.execute("PRAGMA journal_mode=DELETE").fetchone()[0] == "delete"
+    schema = auth._get_db().execute("SELECT sql FROM sqlite_master WHERE name = 'users'").fetchone()[0]
+    conn.execute(schema)
+    conn.execute(INSERT_USER, (USERNAME,))
+    conn.commit()
+    conn.close()
+
+
+def run(n_requests: int, threads: int) -> float:
+    client = webapp.app.test_client()
+    with client.session_transaction() as sess:
+        sess["user"] = USERNAME
+
+    def one(_):
+        resp = client.get("/api/auth/status")
+        assert resp.status_code == 200 and resp.get_json()["logged_in"], resp.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(n_requests)))
+    return n_requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 16])
+    args = parser.parse_args()
+    setup_users()
+
+    print(f"{args.requests} Requests auf /api/auth/status (eingeloggt)")
+    for threads in args.threads:
+        for name, check in (("legacy", legacy_is_admin), ("pooled", pooled_is_admin)):
+            webapp.is_admin = check
+            rps = run(args.requests, threads)
+            print(f"  {name:<7} threads={threads:<3} {rps:8.1f} req/s")
+    webapp.is_admin = pooled_is_admin
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Mikrobenchmark: kompilierter Titel-Klassifikator vs. die früheren any()-Substring-Scans.
+
+Nutzt die Rezepttitel aus dem Katalog (DATA_DIR/recipes.db), falls genügend
+vorhanden sind, sonst synthetische Titel aus den Suchbegriffen.
+
+    python benchmarks/bench_classifier.py --titles 5000 --rounds 5
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import planner  # noqa: E402
+from planner import (  # noqa: E402
+    DESSERT_SEARCH_TERMS, EXCLUDE_TITLE_KEYWORDS, SEARCH_TERMS, STARTER_SEARCH_TERMS,
+    TYPE_DESSERT, TYPE_MAIN, TYPE_STARTER, _DESSERT_KEYWORDS, _STARTER_KEYWORDS,
+)
+
+
+def legacy_classify(title: str) -> int:
+    t = title.lower()
+    mask = 0
+    if not any(kw in t for kw in EXCLUDE_TITLE_KEYWORDS):
+        mask |= TYPE_MAIN
+    if any(kw in t for kw in _STARTER_KEYWORDS):
+        mask |= TYPE_STARTER
+    if any(kw in t for kw in _DESSERT_KEYWORDS):
+        mask |= TYPE_DESSERT
+    return mask
+
+
+def load_titles(n: int) -> list[str]:
+    db = Path(os.getenv("DATA_DIR", Path(__file__).resolve().parent.parent)) / "recipes.db"
+    if db.exists():
+        conn = sqlite3.connect(db)
+        titles = [row[0] for row in conn.execute("SELECT DISTINCT name FROM recipes LIMIT ?", (n,))]
+        conn.close()
+        if len(titles) >= min(n, 1000):
+            return titles
+    rng = random.Random(42)
+    words = SEARCH_TERMS + STARTER_SEARCH_TERMS + DESSERT_SEARCH_TERMS
+    extras = ["mit", "und", "an", "Kräutern", "Tomaten", "Rahmsauce", "Sommer", "Omas", "schnelle"]
+    return [
+        " ".join(rng.choice(words) if i % 2 == 0 else rng.choice(extras) for i in range(rng.randint(2, 6)))
+        for _ in range(n)
+    ]
+
+
+def bench(fn, titles, rounds) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        planner.classify_title.cache_clear()
+        start = time.perf_counter()
+        for t in titles:
+            fn(t)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    titles = load_titles(args.titles)
+    mismatches = [t for t in titles if legacy_classify(t) != planner.classify_title(t)]
+    print(f"{len(titles)} Titel, {len(mismatches)} Abweichungen")
+
+    legacy = bench(legacy_classify, titles, args.rounds)
+    compiled = bench(planner.classify_title.__wrapped__, titles, args.rounds)
+    print(f"  any()-Scans:        {legacy * 1e6 / len(titles):7.2f} µs/Titel")
+    print(f"  kompiliertes Regex: {compiled * 1e6 / len(titles):7.2f} µs/Titel  ({legacy / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Speicher-Benchmark: kompakte RecipeInfo vs. die frühere @dataclass-Variante.
+
+Baut N Rezepte aus synthetischen Algolia-Treffern und misst den belegten
+Speicher mit tracemalloc sowie die Kosten wiederholter to_dict()-Aufrufe.
+
+    python benchmarks/bench_recipe_memory.py --recipes 20000
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from planner import RecipeInfo, _parse_algolia_hit  # noqa: E402
+
+
+@dataclass
+class LegacyRecipeInfo:
+    id: str
+    name: str
+    total_time: int
+    source: str
+    collection_name: str
+    thumbnail: str | None = None
+    image: str | None = None
+    url: str | None = None
+    rating: float = 0.0
+
+    def total_time_str(self) -> str:
+        minutes = self.total_time // 60
+        if minutes >= 60:
+            h, m = divmod(minutes, 60)
+            return f"{h} Std. {m} Min." if m else f"{h} Std."
+        return f"{minutes} Min."
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id, "name": self.name, "total_time": self.total_time,
+            "total_time_str": self.total_time_str(), "source": self.source,
+            "collection_name": self.collection_name, "thumbnail": self.thumbnail,
+            "image": self.image, "url": self.url, "rating": self.rating,
+        }
+
+
+def legacy_parse(hit: dict, country: str, language: str) -> LegacyRecipeInfo:
+    # Entspricht dem früheren _parse_algolia_hit (ohne Typ-Filter)
+    img_url = hit["image"].replace("{assethost}", "assets.tmecosys.com")
+    thumbnail = img_url.replace("{transformation}", "t_web_rdp_recipe_584x480")
+    image = img_url.replace("{transformation}", "t_web_rdp_recipe_584x480")
+    url = f"https://cookidoo.{country}/recipes/recipe/{language}/{hit['id']}"
+    return LegacyRecipeInfo(
+        id=hit["id"], name=hit["title"], total_time=int(float(hit["totalTime"])),
+        source="search", collection_name="Cookidoo",
+        thumbnail=thumbnail, image=image, url=url, rating=float(hit["rating"]),
+    )
+
+
+def make_hits(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"r{100000 + i}",
+            "title": f"Gemüsepfanne mit Reis Nr. {i}",
+            "totalTime": str(1200 + i % 3600),
+            "rating": 4.5,
+            "image": "https://{assethost}/{transformation}/prod/img/recipe/" + f"r{100000 + i}.jpg",
+        }
+        for i in range(n)
+    ]
+
+
+def measure(build, hits) -> tuple[list, int]:
+    gc.collect()
+    tracemalloc.start()
+    objs = [build(h) for h in hits]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objs, current
+
+
+def bench_to_dict(objs, rounds: int = 5) -> tuple[float, float]:
+    """(erster Aufruf, Folgeaufrufe) in Sekunden pro Rezept."""
+    start = time.perf_counter()
+    for o in objs:
+        o.to_dict()
+    first = (time.perf_counter() - start) / len(objs)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for o in objs:
+            o.to_dict()
+    return first, (time.perf_counter() - start) / (rounds * len(objs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipes", type=int, default=20000)
+    args = parser.parse_args()
+    hits = make_hits(args.recipes)
+
+    legacy, legacy_bytes = measure(lambda h: legacy_parse(h, "de", "de-DE"), hits)
+    compact, compact_bytes = measure(lambda h: _parse_algolia_hit(h, "de", "de-DE"), hits)
+    assert all(a.image == b.image and a.url == b.url for a, b in zip(legacy, compact))
+
+    n = args.recipes
+    print(f"{n} Rezepte")
+    print(f"  @dataclass:   {legacy_bytes / n:7.1f} B/Rezept  ({legacy_bytes / 2**20:6.2f} MiB)")
+    print(f"  RecipeInfo:   {compact_bytes / n:7.1f} B/Rezept  ({compact_bytes / 2**20:6.2f} MiB)"
+          f"  → {100 * (1 - compact_bytes / legacy_bytes):.0f}% weniger")
+    legacy_first, legacy_repeat = bench_to_dict(legacy)
+    compact_first, compact_repeat = bench_to_dict(compact)
+    print(f"  to_dict() erster Aufruf: {legacy_first * 1e6:.2f} µs vs. {compact_first * 1e6:.2f} µs")
+    print(f"  to_dict() wiederholt:    {legacy_repeat * 1e6:.2f} µs vs. {compact_repeat * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
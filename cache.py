@@ -0,0 +1,189 @@
+"""Prozessweite Caches und Request-Bündelung, von allen CookidooPlanner-Instanzen geteilt."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-sicherer LRU-Cache mit Ablaufzeit und Grössenlimit.
+
+    Einträge verfallen nach `ttl` Sekunden; wird `maxsize` überschritten,
+    fliegt der am längsten nicht genutzte Eintrag raus.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 900.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> tuple[Any, bool]:
+        """(Wert, frisch?) – abgelaufene Einträge werden weiter geliefert statt gelöscht.
+
+        Für stale-while-revalidate: der Aufrufer erneuert den Wert im Hintergrund.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default, False
+            expires_at, value = entry
+            self._data.move_to_end(key)
+            if expires_at <= now:
+                self.stale_hits += 1
+                return value, False
+            self.hits += 1
+            return value, True
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Prüft ohne Statistik-Effekt, ob ein gültiger Eintrag existiert."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry is not _MISSING and entry[0] > time.monotonic()
+
+    def expires_in(self, key: Hashable) -> float | None:
+        """Sekunden bis zum Ablauf (negativ: abgelaufen), None ohne Eintrag; ohne Statistik-Effekt."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return None if entry is _MISSING else entry[0] - time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "stale_hits": self.stale_hits,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+class SingleFlight:
+    """Bündelt gleichzeitige, identische Aufrufe zu einem einzigen (single-flight).
+
+    Wer einen Key anfragt, der bereits unterwegs ist, wartet auf dasselbe
+    Ergebnis statt einen eigenen Netzwerk-Aufruf zu starten. Die geteilte
+    Arbeit ist gegen Abbruch einzelner Aufrufer geschützt (shield).
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def _register(self, key: Hashable, fut: asyncio.Future) -> None:
+        self._inflight[key] = fut
+
+        def forget(_):
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+        fut.add_done_callback(forget)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.coalesced += 1
+            return await asyncio.shield(fut)
+        self.calls += 1
+        task = asyncio.ensure_future(factory())
+        self._register(key, task)
+        return await asyncio.shield(task)
+
+    async def do_many(self, keys: list[Hashable],
+                      factory: Callable[[list[int]], Awaitable[list]]) -> list:
+        """Wie `do`, aber für mehrere Keys mit einem gemeinsamen Aufruf.
+
+        `factory` bekommt die Indizes der Keys, die nicht schon unterwegs sind,
+        und liefert deren Ergebnisse in derselben Reihenfolge.
+        """
+        waiting: dict[int, asyncio.Future] = {}
+        own: list[int] = []
+        for i, key in enumerate(keys):
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                waiting[i] = fut
+            else:
+                own.append(i)
+
+        if own:
+            self.calls += len(own)
+            loop = asyncio.get_running_loop()
+            futures = {i: loop.create_future() for i in own}
+            for i in own:
+                self._register(keys[i], futures[i])
+            task = asyncio.ensure_future(factory(own))
+
+            def resolve(t: asyncio.Task):
+                for n, i in enumerate(own):
+                    fut = futures[i]
+                    if t.cancelled():
+                        fut.cancel()
+                    elif t.exception() is not None:
+                        fut.set_exception(t.exception())
+                    else:
+                        fut.set_result(t.result()[n])
+
+            task.add_done_callback(resolve)
+            waiting.update(futures)
+
+        results = [None] * len(keys)
+        for i, fut in waiting.items():
+            results[i] = await asyncio.shield(fut)
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
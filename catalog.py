@@ -0,0 +1,222 @@
+"""Persistenter Rezeptkatalog (SQLite) aus Algolia-Treffern und Sammlungsrezepten."""
+
+import json
+import sqlite3
+import time
+
+from auth import DATA_DIR
+
+CATALOG_PATH = DATA_DIR / "recipes.db"
+
+# Zutaten werden als eine Textspalte gespeichert (normalisierte Namen, zeilenweise)
+INGREDIENT_SEP = "\n"
+
+
+def _get_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(CATALOG_PATH, timeout=10)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def init_catalog():
+    """Katalog- und Snapshot-Tabellen anlegen."""
+    conn = _get_db()
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS recipes (
+            id TEXT NOT NULL,
+            country TEXT NOT NULL,
+            type TEXT NOT NULL,
+            source TEXT NOT NULL,
+            name TEXT NOT NULL,
+            total_time INTEGER NOT NULL DEFAULT 0,
+            rating REAL NOT NULL DEFAULT 0,
+            thumbnail TEXT,
+            image TEXT,
+            url TEXT,
+            language TEXT,
+            ingredients TEXT,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (id, country, type)
+        );
+        CREATE INDEX IF NOT EXISTS idx_recipes_pool
+            ON recipes (country, type, source, language);
+        CREATE TABLE IF NOT EXISTS session_snapshots (
+            username TEXT PRIMARY KEY,
+            pools_json TEXT,
+            plan_json TEXT,
+            updated_at REAL NOT NULL
+        );
+    """)
+    # Migration: Zutaten-Spalte für bestehende Kataloge
+    columns = [row["name"] for row in conn.execute("PRAGMA table_info(recipes)").fetchall()]
+    if "ingredients" not in columns:
+        conn.execute("ALTER TABLE recipes ADD COLUMN ingredients TEXT")
+    conn.commit()
+    conn.close()
+
+
+def save_recipes(recipes: list, country: str, recipe_type: str, source: str) -> None:
+    """Rezepte einfügen oder aktualisieren (write-through aus dem Planner).
+
+    Bereits bekannte Bild-/URL-Felder werden nicht mit NULL überschrieben,
+    damit angereicherte Sammlungsrezepte ihre Details behalten.
+    """
+    if not recipes:
+        return
+    now = time.time()
+    conn = _get_db()
+    conn.executemany(
+        """
+        INSERT INTO recipes (id, country, type, source, name, total_time, rating,
+                             thumbnail, image, url, language, ingredients, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (id, country, type) DO UPDATE SET
+            source = excluded.source,
+            name = excluded.name,
+            total_time = excluded.total_time,
+            rating = CASE WHEN excluded.rating > 0 THEN excluded.rating ELSE recipes.rating END,
+            thumbnail = COALESCE(excluded.thumbnail, recipes.thumbnail),
+            image = COALESCE(excluded.image, recipes.image),
+            url = COALESCE(excluded.url, recipes.url),
+            language = COALESCE(excluded.language, recipes.language),
+            ingredients = COALESCE(excluded.ingredients, recipes.ingredients),
+            updated_at = excluded.updated_at
+        """,
+        [
+            (r.id, country, recipe_type, source, r.name, r.total_time, r.rating,
+             r.thumbnail, r.image, r.url, r.language or None,
+             INGREDIENT_SEP.join(r.ingredients) or None, now)
+            for r in recipes
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def load_recipes(country: str, recipe_type: str, languages: list[str] | None = None,
+                 limit: int = 1000) -> list[dict]:
+    """Algolia-Rezepte eines Typs aus dem Katalog laden (neueste zuerst)."""
+    query = "SELECT * FROM recipes WHERE country = ? AND type = ? AND source = 'search'"
+    params: list = [country, recipe_type]
+    if languages:
+        query += f" AND language IN ({', '.join('?' for _ in languages)})"
+        params.extend(languages)
+    query += " ORDER BY updated_at DESC LIMIT ?"
+    params.append(limit)
+    conn = _get_db()
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+def get_recipe_media(recipe_id: str, country: str) -> dict | None:
+    """Bekannte Bild-/URL-Felder und Zutaten eines Rezepts holen (egal aus welcher Quelle)."""
+    conn = _get_db()
+    row = conn.execute(
+        "SELECT thumbnail, image, url, ingredients FROM recipes "
+        "WHERE id = ? AND country = ? AND image IS NOT NULL "
+        "ORDER BY ingredients IS NULL LIMIT 1",
+        (recipe_id, country),
+    ).fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def load_recipe_ingredients(country: str, recipe_ids: list[str]) -> dict[str, str]:
+    """Bekannte Zutaten (INGREDIENT_SEP-getrennt) pro Rezept-ID, egal aus welcher Quelle."""
+    ids = list(dict.fromkeys(recipe_ids))
+    found: dict[str, str] = {}
+    conn = _get_db()
+    # In Blöcken, damit die Anzahl SQL-Parameter begrenzt bleibt
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        rows = conn.execute(
+            f"SELECT id, ingredients FROM recipes WHERE country = ? AND ingredients IS NOT NULL "
+            f"AND id IN ({', '.join('?' for _ in chunk)})",
+            [country, *chunk],
+        ).fetchall()
+        for row in rows:
+            found.setdefault(row["id"], row["ingredients"])
+    conn.close()
+    return found
+
+
+def update_recipe_media(country: str, media: list[tuple]) -> None:
+    """Angereicherte Details speichern.
+
+    `media` enthält Tupel (recipe_id, thumbnail, image, url, ingredients);
+    aktualisiert werden alle Katalog-Einträge des jeweiligen Rezepts.
+    """
+    if not media:
+        return
+    now = time.time()
+    conn = _get_db()
+    conn.executemany(
+        "UPDATE recipes SET thumbnail = ?, image = ?, url = COALESCE(?, url), "
+        "ingredients = COALESCE(?, ingredients), updated_at = ? "
+        "WHERE id = ? AND country = ?",
+        [(thumbnail, image, url, INGREDIENT_SEP.join(ingredients) or None, now, recipe_id, country)
+         for recipe_id, thumbnail, image, url, ingredients in media],
+    )
+    conn.commit()
+    conn.close()
+
+
+def load_ingredient_counts(language: str) -> dict[str, int]:
+    """Zutatennamen einer Sprache mit Anzahl Rezepten (für den Autocomplete-Index)."""
+    conn = _get_db()
+    rows = conn.execute(
+        "SELECT DISTINCT id, ingredients FROM recipes WHERE language = ? AND ingredients IS NOT NULL",
+        (language,),
+    ).fetchall()
+    conn.close()
+    counts: dict[str, int] = {}
+    for row in rows:
+        for name in row["ingredients"].split(INGREDIENT_SEP):
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def save_session_snapshot(username: str, pools: dict | None = None, plan: dict | None = None) -> None:
+    """Pools und/oder aktuellen Plan eines Users sichern (None = unverändert lassen)."""
+    conn = _get_db()
+    conn.execute(
+        """
+        INSERT INTO session_snapshots (username, pools_json, plan_json, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (username) DO UPDATE SET
+            pools_json = COALESCE(excluded.pools_json, session_snapshots.pools_json),
+            plan_json = COALESCE(excluded.plan_json, session_snapshots.plan_json),
+            updated_at = excluded.updated_at
+        """,
+        (username,
+         json.dumps(pools, separators=(",", ":")) if pools is not None else None,
+         json.dumps(plan, separators=(",", ":")) if plan is not None else None,
+         time.time()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def load_session_snapshot(username: str) -> dict | None:
+    """Gesicherten Zustand laden → {"pools", "plan", "updated_at"} oder None."""
+    conn = _get_db()
+    row = conn.execute(
+        "SELECT pools_json, plan_json, updated_at FROM session_snapshots WHERE username = ?",
+        (username,),
+    ).fetchone()
+    conn.close()
+    if not row:
+        return None
+    return {
+        "pools": json.loads(row["pools_json"]) if row["pools_json"] else None,
+        "plan": json.loads(row["plan_json"]) if row["plan_json"] else None,
+        "updated_at": row["updated_at"],
+    }
+
+
+def delete_session_snapshot(username: str) -> None:
+    conn = _get_db()
+    conn.execute("DELETE FROM session_snapshots WHERE username = ?", (username,))
+    conn.commit()
+    conn.close()
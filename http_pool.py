@@ -0,0 +1,107 @@
+"""Gemeinsamer Verbindungs-Pool für zustandslose HTTP-Ziele (Algolia).
+
+Cookidoo-Sessions tragen User-Cookies und bleiben pro Planner getrennt;
+Algolia-Anfragen sind zustandslos und teilen sich hier Keep-Alive-Verbindungen,
+DNS-Cache und Host-Limits über alle User hinweg.
+"""
+
+import os
+import time
+
+import aiohttp
+
+
+class SharedHTTPPool:
+    """Lazy erzeugte, prozessweite ClientSession mit abgestimmtem TCPConnector."""
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 32,
+                 ttl_dns_cache: int = 300, keepalive_timeout: float = 60.0):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self._session: aiohttp.ClientSession | None = None
+        self._connector: aiohttp.TCPConnector | None = None
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.queued = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.requests += 1
+
+        async def on_queued_start(session, ctx, params):
+            ctx.queued_at = time.perf_counter()
+
+        async def on_queued_end(session, ctx, params):
+            waited = time.perf_counter() - ctx.queued_at
+            self.queued += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        async def on_create_end(session, ctx, params):
+            self.connections_created += 1
+
+        async def on_reuse(session, ctx, params):
+            self.connections_reused += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_queued_start.append(on_queued_start)
+        trace.on_connection_queued_end.append(on_queued_end)
+        trace.on_connection_create_end.append(on_create_end)
+        trace.on_connection_reuseconn.append(on_reuse)
+        return trace
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Gemeinsame Session holen (wird beim ersten Aufruf im laufenden Loop erzeugt)."""
+        if self._session is None or self._session.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.ttl_dns_cache,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=self._connector,
+                trace_configs=[self._trace_config()],
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._connector = None
+
+    def stats(self) -> dict:
+        connector = self._connector
+        in_use = len(getattr(connector, "_acquired", ())) if connector else 0
+        idle = sum(len(v) for v in getattr(connector, "_conns", {}).values()) if connector else 0
+        return {
+            "open": in_use + idle,
+            "in_use": in_use,
+            "idle": idle,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "acquire_waits": self.queued,
+            "acquire_wait_ms_avg": round(self._wait_total / self.queued * 1000, 2) if self.queued else 0.0,
+            "acquire_wait_ms_max": round(self._wait_max * 1000, 2),
+        }
+
+
+# Verbindungs-Pool für Algolia (alle User, alle Planner)
+algolia_pool = SharedHTTPPool(
+    limit=int(os.getenv("ALGOLIA_POOL_LIMIT", 100)),
+    limit_per_host=int(os.getenv("ALGOLIA_POOL_PER_HOST", 32)),
+    ttl_dns_cache=int(os.getenv("ALGOLIA_DNS_TTL", 300)),
+    keepalive_timeout=float(os.getenv("ALGOLIA_KEEPALIVE", 60)),
+)
@@ -0,0 +1,106 @@
+"""Lokaler Präfix-Index für die Zutaten-Autovervollständigung."""
+
+import threading
+from bisect import bisect_left, insort
+
+
+class IngredientIndex:
+    """Zutatennamen mit Häufigkeiten, durchsuchbar per Präfix (sortiertes Array + Bisect).
+
+    Jeder Name wird unter jedem Wortanfang eingetragen ("rote zwiebeln" auch
+    unter "zwiebeln"), wie die Facet-Suche von Algolia. Von Algolia beantwortete
+    Präfixe werden gemerkt; lieferte die Facet-Suche weniger als `limit`
+    Treffer, gilt der Präfix als vollständig und auch alle Verlängerungen
+    werden nur noch lokal beantwortet.
+    """
+
+    def __init__(self):
+        self._names: dict[str, list] = {}  # lowercase → [Anzeigename, Häufigkeit]
+        self._keys: list[tuple[str, str]] = []  # (Wortanfang, lowercase-Name), sortiert
+        self._answered: set[str] = set()
+        self._complete: set[str] = set()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.remote_lookups = 0
+
+    @staticmethod
+    def _suffixes(name: str):
+        start = 0
+        for word in name.split(" "):
+            if word:
+                yield name[start:]
+            start += len(word) + 1
+
+    def add(self, name: str, count: int = 1, display: str | None = None) -> None:
+        """Name eintragen; Facet-Zählungen (absolut) überschreiben kleinere lokale Werte."""
+        key = " ".join(name.lower().split())
+        if not key:
+            return
+        with self._lock:
+            entry = self._names.get(key)
+            if entry is None:
+                self._names[key] = [display or key[:1].upper() + key[1:], count]
+                for suffix in self._suffixes(key):
+                    insort(self._keys, (suffix, key))
+            else:
+                entry[1] = max(entry[1], count) if display else entry[1] + count
+                if display:
+                    entry[0] = display
+
+    def add_many(self, counts: dict[str, int]) -> None:
+        """Viele Namen auf einmal (z.B. aus dem Katalog) – sortiert nur einmal."""
+        with self._lock:
+            for name, count in counts.items():
+                key = " ".join(name.lower().split())
+                if not key:
+                    continue
+                entry = self._names.get(key)
+                if entry is None:
+                    self._names[key] = [key[:1].upper() + key[1:], count]
+                    self._keys.extend((suffix, key) for suffix in self._suffixes(key))
+                else:
+                    entry[1] += count
+            self._keys.sort()
+
+    def mark_answered(self, prefix: str, complete: bool = False) -> None:
+        with self._lock:
+            (self._complete if complete else self._answered).add(prefix.lower())
+
+    def is_warm(self, prefix: str) -> bool:
+        """Präfix schon (oder über einen vollständigen kürzeren Präfix) von Algolia beantwortet?"""
+        prefix = prefix.lower()
+        return prefix in self._answered or any(
+            prefix[:n] in self._complete for n in range(1, len(prefix) + 1)
+        )
+
+    def search(self, prefix: str, limit: int = 10) -> tuple[int, list[str]]:
+        """Häufigste Namen mit einem Wortanfang `prefix` → (Summe der Häufigkeiten, Namen)."""
+        prefix = " ".join(prefix.lower().split())
+        with self._lock:
+            found: set[str] = set()
+            i = bisect_left(self._keys, (prefix, ""))
+            while i < len(self._keys) and self._keys[i][0].startswith(prefix):
+                found.add(self._keys[i][1])
+                i += 1
+            entries = [self._names[key] for key in found]
+        entries.sort(key=lambda e: (-e[1], len(e[0])))
+        return sum(e[1] for e in entries), [e[0] for e in entries[:limit]]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def stats(self) -> dict:
+        total = self.local_hits + self.remote_lookups
+        return {
+            "names": len(self._names),
+            "keys": len(self._keys),
+            "answered_prefixes": len(self._answered),
+            "complete_prefixes": len(self._complete),
+            "local_hits": self.local_hits,
+            "remote_lookups": self.remote_lookups,
+            "local_rate": round(self.local_hits / total, 3) if total else 0.0,
+        }
+
+
+# Ein Index pro Rezeptsprache (2-Buchstaben-Code), von allen Usern geteilt
+ingredient_indexes: dict[str, IngredientIndex] = {}
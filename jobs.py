@@ -0,0 +1,125 @@
+"""Hintergrund-Jobs für lange Cookidoo-Operationen (Kalender speichern, Einkaufsliste)."""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Awaitable, Callable
+
+log = logging.getLogger("cookidoo")
+
+# Abgeschlossene Jobs bleiben so lange abfragbar (Sekunden)
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", 3600))
+
+
+class Job:
+    """Ein Hintergrund-Job mit Status und Fortschritt (done/total)."""
+
+    def __init__(self, user: str, kind: str):
+        self.id = uuid.uuid4().hex
+        self.user = user
+        self.kind = kind
+        self.status = "queued"  # queued → running → done | failed
+        self.done = 0
+        self.total = 0
+        self.result: dict | None = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+
+    def progress(self, done: int, total: int) -> None:
+        self.done = done
+        self.total = total
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": {"done": self.done, "total": self.total},
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Jobs laufen als Tasks auf dem Event-Loop, pro User nacheinander.
+
+    `submit` muss auf dem Cookidoo-Loop aufgerufen werden (z.B. aus
+    `_submit_save` in der async Route) und kehrt sofort zurück; der Status
+    wird über `get` abgefragt.
+    """
+
+    def __init__(self, retention: float = JOB_RETENTION):
+        self.retention = retention
+        self._jobs: dict[str, Job] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.submitted = 0
+        self.failed = 0
+
+    def submit(self, user: str, kind: str, work: Callable[[Job], Awaitable[dict]]) -> Job:
+        self._purge()
+        job = Job(user, kind)
+        self._jobs[job.id] = job
+        self.submitted += 1
+        task = asyncio.create_task(self._run(job, work))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: Job, work: Callable[[Job], Awaitable[dict]]) -> None:
+        lock = self._locks.setdefault(job.user, asyncio.Lock())
+        async with lock:
+            job.status = "running"
+            started = time.perf_counter()
+            try:
+                job.result = await work(job)
+                job.status = "done"
+            except Exception as e:
+                job.error = str(e)
+                job.status = "failed"
+                self.failed += 1
+                log.warning(f"[{job.user}] Job {job.kind} {job.id[:8]} fehlgeschlagen: {e}")
+            finally:
+                job.finished_at = time.time()
+            log.info(f"[{job.user}] Job {job.kind} {job.id[:8]}: {job.status} "
+                     f"({job.done}/{job.total}) in {time.perf_counter() - started:.1f}s")
+
+    def get(self, job_id: str, user: str) -> Job | None:
+        """Job eines Users (fremde Jobs sind nicht sichtbar)."""
+        job = self._jobs.get(job_id)
+        return job if job and job.user == user else None
+
+    def has_active(self, user: str) -> bool:
+        """Hat der User einen wartenden oder laufenden Job?"""
+        return any(job.user == user and job.finished_at is None for job in list(self._jobs.values()))
+
+    def _purge(self) -> None:
+        cutoff = time.time() - self.retention
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at < cutoff:
+                del self._jobs[job_id]
+        # Locks nur für User mit wartendem oder laufendem Job behalten
+        active = {job.user for job in self._jobs.values() if job.finished_at is None}
+        for user in list(self._locks):
+            if user not in active:
+                del self._locks[user]
+
+    def stats(self) -> dict:
+        by_status: dict[str, int] = {}
+        for job in list(self._jobs.values()):
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {
+            "jobs": len(self._jobs),
+            "by_status": by_status,
+            "submitted": self.submitted,
+            "failed": self.failed,
+        }
+
+
+# Speicher-/Export-Jobs aller User
+save_jobs = JobQueue()
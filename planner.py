@@ -1,23 +1,116 @@
 """Cookidoo Wochenplan-Generator - Planungslogik."""
 
 import asyncio
+import base64
+import binascii
 import logging
+import os
 import random
 import re
-from dataclasses import dataclass
+import sys
+import time
 from datetime import date, timedelta
+from functools import lru_cache
+from typing import Awaitable, Callable, NamedTuple
+from urllib.parse import urlencode, urlparse
 
 import aiohttp
 from bring_api import Bring, BringItemOperation
 from cookidoo_api import Cookidoo, CookidooConfig
 from cookidoo_api.helpers import get_localization_options
-from cookidoo_api.types import CookidooCollection
+from cookidoo_api.types import CookidooAuthData, CookidooCollection, CookidooLocalizationConfig
+
+import catalog
+from cache import SingleFlight, TTLCache
+from http_pool import algolia_pool
+from ingredient_index import IngredientIndex, ingredient_indexes
+from pool import OTHER_SOURCES, OWN_SOURCES, RecipePool
 
 log = logging.getLogger("cookidoo")
 
 # Algolia-Konfiguration
 ALGOLIA_APP_ID = "3TA8NT85XJ"
-ALGOLIA_SEARCH_URL = f"https://{ALGOLIA_APP_ID}-dsn.algolia.net/1/indexes/recipes-production/query"
+ALGOLIA_INDEX = "recipes-production"
+ALGOLIA_SEARCH_URL = f"https://{ALGOLIA_APP_ID}-dsn.algolia.net/1/indexes/{ALGOLIA_INDEX}/query"
+ALGOLIA_MULTI_QUERY_URL = f"https://{ALGOLIA_APP_ID}-dsn.algolia.net/1/indexes/*/queries"
+# Maximale Anzahl Suchbegriffe pro Multi-Query-Request
+ALGOLIA_BATCH_SIZE = 50
+
+class AlgoliaQuery(NamedTuple):
+    """Eine Algolia-Suche samt Sprachfilter und Locale; zugleich der Cache-Key.
+
+    Wird einmal vor dem ersten await gebildet, damit Request und Cache-Eintrag
+    denselben Sprachfilter nutzen, auch wenn der User ihn inzwischen ändert.
+    """
+    query: str
+    count: int
+    filters: str
+    language_filter: str
+    recipe_type: str
+    country: str
+    language: str
+
+
+# Prozessweiter Cache für geparste Algolia-Treffer (von allen Usern geteilt)
+# Key: AlgoliaQuery
+algolia_cache = TTLCache(
+    maxsize=int(os.getenv("ALGOLIA_CACHE_SIZE", 2000)),
+    ttl=float(os.getenv("ALGOLIA_CACHE_TTL", 1800)),
+)
+
+# Bündelung identischer, gleichzeitiger Aufrufe (Metriken unter /api/admin/stats)
+algolia_flight = SingleFlight()   # Key: Algolia-Cache-Key
+cookidoo_flight = SingleFlight()  # Key: (Art, ...) – Pool-Ladevorgänge, Rezeptdetails
+
+# Prozessweiter Cache für Rezeptdetails (Bilder, URL, Zutaten) aus get_recipe_details
+# Key: (country, recipe_id) → (thumbnail, image, url, ingredients); persistiert über den Katalog
+recipe_details_cache = TTLCache(
+    maxsize=int(os.getenv("DETAILS_CACHE_SIZE", 5000)),
+    ttl=float(os.getenv("DETAILS_CACHE_TTL", 7 * 86400)),
+)
+
+# Algolia-Key pro (country, language), von allen Usern geteilt: (key, gültig bis Epoch)
+# Ablauf aus dem validUntil des Secured-Keys, sonst ALGOLIA_KEY_TTL
+algolia_keys = TTLCache(maxsize=64, ttl=7 * 86400)
+ALGOLIA_KEY_TTL = float(os.getenv("ALGOLIA_KEY_TTL", 6 * 3600))
+# So lange vor Ablauf wird der Key im Hintergrund erneuert
+ALGOLIA_KEY_REFRESH = float(os.getenv("ALGOLIA_KEY_REFRESH", 600))
+# Letzter Abrufversuch pro Locale; auch erzwungene Abrufe (abgelehnter Key) laufen
+# höchstens alle ALGOLIA_KEY_RETRY Sekunden, statt bei jedem Request die Suchseite zu laden
+_algolia_key_attempts: dict[tuple[str, str], float] = {}
+ALGOLIA_KEY_RETRY = float(os.getenv("ALGOLIA_KEY_RETRY", 60))
+
+# Prozessweit erkannter Zutaten-Facet pro (Index, Sprache): Attributname oder "" (keiner).
+# Wird kurz vor Ablauf periodisch erneuert (refresh_ingredient_facets); ein trotzdem
+# abgelaufener Wert wird weiter benutzt und im Hintergrund neu ermittelt
+ingredient_facets = TTLCache(maxsize=64, ttl=float(os.getenv("FACET_TTL", 86400)))
+# Letzter Erneuerungsversuch pro (Index, Sprache), höchstens einer pro Minute
+_facet_refresh_attempts: dict[tuple[str, str], float] = {}
+# Prozessweit, damit _cancel_background eines Users die Erneuerung nicht abbricht
+_facet_refresh_tasks: set[asyncio.Task] = set()
+FACET_CANDIDATES = ["ingredientNames", "ingredients", "ingredient", "ingredientList", "zutaten"]
+
+# Maximale Anzahl gleichzeitiger get_recipe_details-Anfragen beim Vorwärmen
+ENRICH_CONCURRENCY = int(os.getenv("ENRICH_CONCURRENCY", 6))
+
+# Unter so vielen Rezepten wird ein gefilterter Algolia-Pool aufgestockt
+SEARCH_POOL_MIN = int(os.getenv("SEARCH_POOL_MIN", 40))
+
+# Maximale Anzahl gleichzeitiger Cookidoo-Anfragen beim Laden der Sammlungsseiten
+COLLECTION_CONCURRENCY = int(os.getenv("COLLECTION_CONCURRENCY", 4))
+
+# Ab so vielen Katalog-Rezepten wird ein Pool lokal vorgewärmt statt via Algolia geladen
+CATALOG_WARM_MIN = int(os.getenv("CATALOG_WARM_MIN", 150))
+
+# Grobe Speicherschätzung pro Planner (vgl. benchmarks/bench_recipe_memory.py)
+PLANNER_BASE_BYTES = 64 * 1024  # Cookidoo-Client, aiohttp-Session, Cookies
+RECIPE_BYTES = 400  # RecipeInfo inkl. Strings und Listeneintrag
+POOL_ROW_BYTES = 130  # Spalten-Arrays, ID-Index und Zutaten-Postings pro Pool-Zeile
+
+# Kalender-Schreibzugriffe: gleichzeitige Requests pro User, Versuche pro Eintrag, Backoff-Basis (s)
+CALENDAR_CONCURRENCY = int(os.getenv("CALENDAR_CONCURRENCY", 4))
+CALENDAR_RETRIES = int(os.getenv("CALENDAR_RETRIES", 3))
+CALENDAR_RETRY_DELAY = float(os.getenv("CALENDAR_RETRY_DELAY", 0.5))
 
 # ===== Suchbegriffe =====
 
@@ -53,6 +146,23 @@ DESSERT_SEARCH_TERMS = [
     "Soufflé", "Parfait", "Strudel",
 ]
 
+# Zusätzliche Suchbegriffe pro Kategorie/Küche (search_with_filters)
+CATEGORY_TERMS = {
+    "vegetarisch": ["vegetarisch", "gemüse", "veggie"],
+    "vegan": ["vegan", "vegane", "pflanzlich"],
+    "low carb": ["low carb", "kohlenhydratarm"],
+    "high protein": ["high protein", "eiweiss", "proteinreich"],
+}
+
+CUISINE_TERMS = {
+    "italienisch": ["italienisch", "pasta", "risotto", "pizza"],
+    "asiatisch": ["asiatisch", "asia", "wok", "thai"],
+    "mexikanisch": ["mexikanisch", "burrito", "taco", "enchilada"],
+    "indisch": ["indisch", "curry", "tikka", "masala"],
+    "mediterran": ["mediterran", "griechisch", "spanisch"],
+    "orientalisch": ["orientalisch", "falafel", "hummus", "couscous"],
+}
+
 # Keywords-Listen für Typ-Erkennung
 _STARTER_KEYWORDS = [
     "suppe", "cremesuppe", "velout", "consommé", "bouillon",
@@ -97,17 +207,96 @@ EXCLUDE_TITLE_KEYWORDS = [
 ]
 
 
-@dataclass
+# Bild-Template aus Algolia: "{assethost}" und "{transformation}" werden erst beim Zugriff ersetzt
+ASSET_HOST = "assets.tmecosys.com"
+IMAGE_TRANSFORMATION = "t_web_rdp_recipe_584x480"
+
+
 class RecipeInfo:
-    id: str
-    name: str
-    total_time: int  # Sekunden
-    source: str  # "custom", "managed" oder "search"
-    collection_name: str
-    thumbnail: str | None = None
-    image: str | None = None
-    url: str | None = None
-    rating: float = 0.0
+    """Kompaktes Rezept: __slots__, internierte Wiederholungs-Strings, lazy URLs.
+
+    Pools halten tausende Instanzen pro User. Sammlungsname, Quelle, Sprache
+    und URL-Präfix werden interniert, Bild- und Rezept-URLs erst bei Bedarf aus
+    Template bzw. Präfix + ID gebaut und to_dict() wird zwischengespeichert.
+    """
+
+    __slots__ = (
+        "id", "name", "total_time", "source", "collection_name", "rating",
+        "language", "type_mask", "_thumbnail", "_image", "_image_template",
+        "_url", "_url_base", "_dict", "ingredients",
+    )
+
+    def __init__(self, id: str, name: str, total_time: int, source: str, collection_name: str,
+                 thumbnail: str | None = None, image: str | None = None, url: str | None = None,
+                 rating: float = 0.0, language: str = "", type_mask: int = -1,
+                 image_template: str | None = None, url_base: str | None = None,
+                 ingredients: tuple[str, ...] = ()):
+        self.id = id
+        self.name = name
+        self.total_time = total_time  # Sekunden
+        self.source = sys.intern(source)  # "custom", "managed" oder "search"
+        self.collection_name = sys.intern(collection_name)
+        self.rating = rating
+        self.language = sys.intern(language)  # 2-Buchstaben-Code der Rezeptsprache
+        self.type_mask = type_mask  # TYPE_*-Bits, -1 = noch nicht klassifiziert
+        self._image_template = image_template
+        self._url_base = sys.intern(url_base) if url_base else None
+        self._image = image
+        # Gleiche URL für Vorschau und Bild nur einmal speichern
+        self._thumbnail = image if thumbnail == image else thumbnail
+        self._url = url
+        self._dict: dict | None = None
+        # Normalisierte Zutatennamen (lowercase), Grundlage des Zutaten-Index im Pool
+        self.ingredients = tuple(sys.intern(i) for i in ingredients)
+
+    @property
+    def thumbnail(self) -> str | None:
+        if self._thumbnail is None and self._image_template:
+            return self._render_image()
+        return self._thumbnail
+
+    @thumbnail.setter
+    def thumbnail(self, value: str | None) -> None:
+        self._thumbnail = value
+        self._image_template = None if value else self._image_template
+        self._dict = None
+
+    @property
+    def image(self) -> str | None:
+        if self._image is None and self._image_template:
+            return self._render_image()
+        return self._image
+
+    @image.setter
+    def image(self, value: str | None) -> None:
+        self._image = value
+        self._image_template = None if value else self._image_template
+        self._dict = None
+
+    @property
+    def url(self) -> str | None:
+        if self._url is None and self._url_base:
+            return self._url_base + self.id
+        return self._url
+
+    @url.setter
+    def url(self, value: str | None) -> None:
+        self._url = value
+        self._dict = None
+
+    def _render_image(self) -> str:
+        return (self._image_template
+                .replace("{assethost}", ASSET_HOST)
+                .replace("{transformation}", IMAGE_TRANSFORMATION))
+
+    def __repr__(self) -> str:
+        return (f"RecipeInfo(id={self.id!r}, name={self.name!r}, total_time={self.total_time!r}, "
+                f"source={self.source!r}, collection_name={self.collection_name!r})")
+
+    def types(self) -> int:
+        if self.type_mask < 0:
+            self.type_mask = classify_title(self.name)
+        return self.type_mask
 
     def total_time_str(self) -> str:
         minutes = self.total_time // 60
@@ -117,18 +306,36 @@ class RecipeInfo:
         return f"{minutes} Min."
 
     def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "name": self.name,
-            "total_time": self.total_time,
-            "total_time_str": self.total_time_str(),
-            "source": self.source,
-            "collection_name": self.collection_name,
-            "thumbnail": self.thumbnail,
-            "image": self.image,
-            "url": self.url,
-            "rating": self.rating,
-        }
+        if self._dict is None:
+            self._dict = {
+                "id": self.id,
+                "name": self.name,
+                "total_time": self.total_time,
+                "total_time_str": self.total_time_str(),
+                "source": self.source,
+                "collection_name": self.collection_name,
+                "thumbnail": self.thumbnail,
+                "image": self.image,
+                "url": self.url,
+                "rating": self.rating,
+            }
+        return dict(self._dict)
+
+    def to_record(self) -> list:
+        """Kompakte, JSON-taugliche Form für den Session-Snapshot."""
+        return [self.id, self.name, self.total_time, self.source, self.collection_name,
+                self.rating, self.language, self.type_mask, self._image_template,
+                self._image, self._thumbnail, self._url, self._url_base, list(self.ingredients)]
+
+    @classmethod
+    def from_record(cls, record: list) -> "RecipeInfo":
+        (rid, name, total_time, source, collection_name, rating, language, type_mask,
+         image_template, image, thumbnail, url, url_base, ingredients) = record
+        recipe = cls(rid, name, total_time, source, collection_name, image=image, url=url,
+                     rating=rating, language=language, type_mask=type_mask,
+                     image_template=image_template, url_base=url_base, ingredients=ingredients)
+        recipe._thumbnail = thumbnail
+        return recipe
 
 
 WEEKDAYS_DE = [
@@ -140,19 +347,145 @@ WEEKDAYS_DE = [
 SLOT_ORDER = ["m_v", "m", "m_d", "a_v", "a", "a_d"]
 
 
+# Bitmaske der Rezepttypen, die ein Titel erfüllt
+TYPE_MAIN = 1
+TYPE_STARTER = 2
+TYPE_DESSERT = 4
+_TYPE_BITS = {"main": TYPE_MAIN, "starter": TYPE_STARTER, "dessert": TYPE_DESSERT}
+
+# Treffer-Bits pro Keyword (Hauptgericht-Ausschluss wird separat invertiert)
+_EXCLUDE_BIT = 8
+
+
+def _trie_regex(words) -> str:
+    """Regex-Alternation als Präfix-Baum ("s(?:alat|uppe)" statt "salat|suppe").
+
+    Pythons re prüft Alternativen der Reihe nach; mit gemeinsamen Präfixen
+    scheitert ein Versuch an einer Position schon nach wenigen Zeichen.
+    Optionale Gruppen sind gierig, an jeder Position gewinnt das längste Wort.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(sub) for ch, sub in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        body = f"(?:{'|'.join(branches)})"
+        return body + "?" if "" in node else body
+
+    return build(trie)
+
+
+def _build_title_classifier() -> tuple[re.Pattern, dict[str, int]]:
+    """Ein Regex für alle Typ-Keywords, ausgewertet in einem Durchlauf über den Titel.
+
+    Der Lookahead findet an jeder Position das längste Keyword; jedes Keyword
+    trägt zusätzlich die Bits aller in ihm enthaltenen Keywords
+    ("cremesuppe" ⊃ "suppe"), damit kein überlappender Treffer verloren geht.
+    """
+    bits: dict[str, int] = {}
+    for keywords, bit in ((EXCLUDE_TITLE_KEYWORDS, _EXCLUDE_BIT),
+                          (_STARTER_KEYWORDS, TYPE_STARTER),
+                          (_DESSERT_KEYWORDS, TYPE_DESSERT)):
+        for kw in keywords:
+            bits[kw] = bits.get(kw, 0) | bit
+    closed = {kw: 0 for kw in bits}
+    for kw in bits:
+        for other, bit in bits.items():
+            if other in kw:
+                closed[kw] |= bit
+    return re.compile(f"(?=({_trie_regex(bits)}))"), closed
+
+
+_TITLE_PATTERN, _KEYWORD_BITS = _build_title_classifier()
+
+
+@lru_cache(maxsize=20000)
+def classify_title(title: str) -> int:
+    """Alle Rezepttypen (TYPE_*-Bitmaske) eines Titels in einem Regex-Durchlauf bestimmen."""
+    found = 0
+    for kw in _TITLE_PATTERN.findall(title.lower()):
+        found |= _KEYWORD_BITS[kw]
+    mask = found & (TYPE_STARTER | TYPE_DESSERT)
+    if not found & _EXCLUDE_BIT:
+        mask |= TYPE_MAIN
+    return mask
+
+
+@lru_cache(maxsize=256)
+def keyword_pattern(keywords: tuple[str, ...]) -> re.Pattern:
+    """Kompilierte Alternation für eine Keyword-Liste (Substring-Suche, lowercase)."""
+    return re.compile(_trie_regex({kw.lower() for kw in keywords}))
+
+
 def _is_main_course(title: str) -> bool:
-    title_lower = title.lower()
-    return not any(kw in title_lower for kw in EXCLUDE_TITLE_KEYWORDS)
+    return bool(classify_title(title) & TYPE_MAIN)
 
 
 def _is_starter(title: str) -> bool:
-    t = title.lower()
-    return any(kw in t for kw in _STARTER_KEYWORDS)
+    return bool(classify_title(title) & TYPE_STARTER)
 
 
 def _is_dessert(title: str) -> bool:
-    t = title.lower()
-    return any(kw in t for kw in _DESSERT_KEYWORDS)
+    return bool(classify_title(title) & TYPE_DESSERT)
+
+
+def _ingredient_name(item) -> str:
+    """Zutatenname aus einem Algolia-Feldeintrag (String oder Objekt mit name/title)."""
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        return item.get("name") or item.get("title") or ""
+    return ""
+
+
+def _normalize_ingredients(names) -> tuple[str, ...]:
+    """Zutatennamen kleingeschrieben, ohne Leerstellen und Duplikate."""
+    return tuple(dict.fromkeys(n for n in (name.strip().lower() for name in names) if n))
+
+
+def _catalog_ingredients(text: str | None) -> tuple[str, ...]:
+    return tuple(text.split(catalog.INGREDIENT_SEP)) if text else ()
+
+
+def _hit_ingredients(hit: dict) -> tuple[str, ...]:
+    """Normalisierte, eindeutige Zutaten eines Treffers aus ingredientNames/ingredientList/mainIngredient."""
+    names: list[str] = []
+    for field in ("ingredientNames", "ingredientList", "mainIngredient"):
+        val = hit.get(field)
+        names.extend(_ingredient_name(item) for item in (val if isinstance(val, list) else [val]))
+    return _normalize_ingredients(names)
+
+
+async def _retry(factory: Callable[[], Awaitable], attempts: int = CALENDAR_RETRIES,
+                 base_delay: float = CALENDAR_RETRY_DELAY):
+    """factory() bis zu `attempts` mal ausführen, dazwischen exponentieller Backoff mit Jitter."""
+    for attempt in range(attempts):
+        try:
+            return await factory()
+        except Exception as e:
+            if attempt == attempts - 1:
+                raise
+            delay = base_delay * 2 ** attempt * (0.5 + random.random())
+            log.info(f"Versuch {attempt + 1}/{attempts} fehlgeschlagen ({e}), neuer Versuch in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def _algolia_key_valid_until(api_key: str) -> float | None:
+    """Ablauf (Epoch) eines Algolia-Secured-Keys aus seinem validUntil-Parameter."""
+    try:
+        decoded = base64.b64decode(api_key + "=" * (-len(api_key) % 4)).decode("utf-8", "replace")
+    except (ValueError, binascii.Error):
+        return None
+    match = re.search(r"validUntil=(\d+)", decoded)
+    return float(match.group(1)) if match else None
 
 
 def _parse_algolia_hit(hit: dict, country: str, language: str, recipe_type: str = "main") -> "RecipeInfo | None":
@@ -162,44 +495,84 @@ def _parse_algolia_hit(hit: dict, country: str, language: str, recipe_type: str
         return None
 
     # Typ-spezifischer Filter
-    if recipe_type == "main" and not _is_main_course(name):
-        return None
-    elif recipe_type == "starter" and not _is_starter(name):
-        return None
-    elif recipe_type == "dessert" and not _is_dessert(name):
+    types = classify_title(name)
+    if not types & _TYPE_BITS.get(recipe_type, TYPE_MAIN):
         return None
 
     total_time = int(float(hit.get("totalTime", 0)))
     rating = float(hit.get("rating", hit.get("averageRating", hit.get("ratingValue", 0))) or 0)
 
-    thumbnail = None
+    # Bild-URLs mit Platzhaltern bleiben Template und werden erst bei Zugriff gebaut
     image = None
+    image_template = None
     img_url = hit.get("image", "")
     if img_url:
-        img_url = img_url.replace("{assethost}", "assets.tmecosys.com")
-        if "{transformation}" in img_url:
-            thumbnail = img_url.replace("{transformation}", "t_web_rdp_recipe_584x480")
-            image = img_url.replace("{transformation}", "t_web_rdp_recipe_584x480")
+        if "{" in img_url:
+            image_template = img_url
         else:
-            thumbnail = img_url
             image = img_url
 
-    domain_map = {"de": "cookidoo.de", "at": "cookidoo.at", "ch": "cookidoo.ch",
-                  "gb": "cookidoo.co.uk", "us": "cookidoo.thermomix.com"}
-    domain = domain_map.get(country, f"cookidoo.{country}")
-    url = f"https://{domain}/recipes/recipe/{language}/{recipe_id}"
-
     return RecipeInfo(
         id=recipe_id, name=name, total_time=total_time,
         source="search", collection_name="Cookidoo",
-        thumbnail=thumbnail, image=image, url=url,
-        rating=rating,
+        thumbnail=image, image=image, image_template=image_template,
+        url_base=_recipe_url_base(country, language),
+        rating=rating, language=str(hit.get("language") or language.split("-")[0]),
+        type_mask=types, ingredients=_hit_ingredients(hit),
+    )
+
+
+# Lokalisierungen der cookidoo-api, einmal pro Prozess geladen: (Land, Sprache) → Config
+_localizations: dict[tuple[str, str], CookidooLocalizationConfig] = {}
+
+
+async def load_localizations() -> None:
+    """Lokalisierungstabelle einmal laden (beim Start, sonst beim ersten Login)."""
+    if not _localizations:
+        for option in await get_localization_options():
+            _localizations.setdefault((option.country_code, option.language), option)
+        log.info(f"{len(_localizations)} Cookidoo-Lokalisierungen geladen")
+
+
+def _localization(country: str, language: str) -> CookidooLocalizationConfig | None:
+    """Config der Locale; ohne exakten Treffer die erste des Landes."""
+    option = _localizations.get((country, language))
+    if option is None:
+        option = next((o for (c, _), o in _localizations.items() if c == country), None)
+    return option
+
+
+@lru_cache(maxsize=64)
+def _cookidoo_domain(country: str, language: str) -> str:
+    """Cookidoo-Domain der Locale (aus der Foundation-URL der Lokalisierung)."""
+    option = _localization(country, language)
+    return urlparse(option.url).netloc if option else f"cookidoo.{country}"
+
+
+@lru_cache(maxsize=64)
+def _recipe_url_base(country: str, language: str) -> str:
+    return f"https://{_cookidoo_domain(country, language)}/recipes/recipe/{language}/"
+
+
+def _recipe_from_catalog_row(row: dict) -> RecipeInfo:
+    url = row["url"]
+    url_base = None
+    if url and url.endswith(row["id"]):
+        # Nur das (internierte) Präfix halten, die URL wird aus Präfix + ID gebaut
+        url_base, url = url[:-len(row["id"])], None
+    return RecipeInfo(
+        id=row["id"], name=row["name"], total_time=row["total_time"],
+        source="search", collection_name="Cookidoo",
+        thumbnail=row["thumbnail"], image=row["image"], url=url, url_base=url_base,
+        rating=row["rating"], language=row["language"] or "",
+        ingredients=_catalog_ingredients(row.get("ingredients")),
     )
 
 
 class CookidooPlanner:
     def __init__(self):
         self._cookidoo: Cookidoo | None = None
+        # Cookie-tragende Cookidoo-Session pro User; Algolia läuft über algolia_pool
         self._session: aiohttp.ClientSession | None = None
         self._custom_recipes: list[RecipeInfo] = []
         self._managed_recipes: list[RecipeInfo] = []
@@ -209,12 +582,32 @@ class CookidooPlanner:
         self._logged_in = False
         self._country = "de"
         self._language = "de-DE"
-        self._algolia_api_key: str | None = None
-        # None = unbekannt, "" = kein Facet verfügbar, str = funktionierender Facet-Name
-        self._ingredient_facet: str | None = None
         self._language_filter: str = ""  # Algolia-Filter für Sprachen
-
-    async def login(self, email: str, password: str, country: str = "de", language: str = "de-DE") -> dict:
+        self._languages: list[str] = []
+        # Zustand des letzten search_with_filters (für inkrementelle Aktualisierung)
+        self._filter_fingerprint: tuple | None = None
+        self._filter_terms: list[str] = []
+        self._filter_terms_used: set[str] = set()
+        self._filter_keywords: list[str] = []
+        # Hintergrund-Aktualisierung von aus dem Katalog vorgewärmten Pools
+        self._refresh_tasks: set[asyncio.Task] = set()
+        self._enrich_task: asyncio.Task | None = None
+        # Vorindizierter Pool, wird bei Änderungen der Rezeptlisten neu aufgebaut.
+        # _pools_version zählt jedes Ersetzen/Erweitern einer Rezeptliste.
+        self._pool: RecipePool | None = None
+        self._pool_version = -1
+        self._pools_version = 0
+
+    async def login(self, email: str, password: str, country: str = "de", language: str = "de-DE",
+                    tokens: dict | None = None,
+                    on_tokens: Callable[[dict], None] | None = None) -> dict:
+        """Bei Cookidoo anmelden.
+
+        Mit gespeicherten `tokens` (access/refresh token, expires_at) wird der
+        Passwort-Login übersprungen; die Bibliothek erneuert das Access-Token
+        erst, wenn es abgelaufen ist. Sind die Tokens ungültig, folgt der
+        normale Login. `on_tokens` erhält neue Tokens nach Login und Refresh.
+        """
         if self._session:
             await self._session.close()
 
@@ -222,90 +615,313 @@ class CookidooPlanner:
         self._country = country
         self._language = language
 
-        localizations = await get_localization_options(country=country, language=language)
-        if not localizations:
-            localizations = await get_localization_options(country=country)
-        if not localizations:
+        await cookidoo_flight.do("localizations", load_localizations)
+        localization = _localization(country, language)
+        if not localization:
             raise ValueError(f"Keine Lokalisierung gefunden für {country}/{language}")
 
         self._cookidoo = Cookidoo(
             self._session,
             cfg=CookidooConfig(
                 email=email, password=password,
-                localization=localizations[0],
+                localization=localization,
             ),
+            on_auth_data_update=(lambda auth_data: on_tokens(vars(auth_data))) if on_tokens else None,
         )
 
-        await self._cookidoo.login()
-        user_info = await self._cookidoo.get_user_info()
-        subscription = await self._cookidoo.get_active_subscription()
+        # Algolia-Key braucht keine Anmeldung und lädt parallel zum Login
+        key_task = asyncio.create_task(self._fetch_algolia_key())
+        try:
+            user_info = subscription = None
+            if tokens:
+                try:
+                    self._cookidoo.apply_auth_data(CookidooAuthData(**tokens))
+                    user_info, subscription = await asyncio.gather(
+                        self._cookidoo.get_user_info(), self._cookidoo.get_active_subscription(),
+                    )
+                    log.info(f"Cookidoo-Login mit gespeicherten Tokens für {email}")
+                except Exception as e:
+                    log.info(f"Gespeicherte Cookidoo-Tokens ungültig, voller Login: {e}")
+                    user_info = None
+            if user_info is None:
+                await self._cookidoo.login()
+                user_info, subscription = await asyncio.gather(
+                    self._cookidoo.get_user_info(), self._cookidoo.get_active_subscription(),
+                )
+        finally:
+            await key_task
         self._logged_in = True
-        await self._fetch_algolia_key()
+        # Facet-Erkennung vorziehen, damit die erste Autovervollständigung nicht probt
+        if (ALGOLIA_INDEX, self._language) not in ingredient_facets:
+            self._run_in_background(self._ingredient_facet())
 
         return {
             "username": user_info.username,
             "subscription_active": subscription.active if subscription else False,
         }
 
-    async def _fetch_algolia_key(self):
+    @property
+    def _algolia_api_key(self) -> str | None:
+        """Aktueller Algolia-Key der Locale (prozessweit geteilt)."""
+        entry = algolia_keys.get((self._country, self._language))
+        return entry[0] if entry else None
+
+    async def _fetch_algolia_key(self, force: bool = False) -> None:
+        """Algolia-Key sicherstellen: aus dem Cache, sonst einmal pro Locale laden.
+
+        Läuft der gecachte Key bald ab, wird er im Hintergrund erneuert und
+        bis dahin weiter benutzt. `force` lädt trotz gültigem Key neu, aber wie
+        jeder Abruf höchstens einmal pro ALGOLIA_KEY_RETRY Sekunden und Locale.
+        """
         if not self._session:
             return
-        domain_map = {"de": "cookidoo.de", "at": "cookidoo.at", "ch": "cookidoo.ch",
-                      "gb": "cookidoo.co.uk", "us": "cookidoo.thermomix.com"}
-        domain = domain_map.get(self._country, f"cookidoo.{self._country}")
-        search_url = f"https://{domain}/search/{self._language}"
+        key = (self._country, self._language)
+        entry = None if force else algolia_keys.get(key)
+        remaining = entry[1] - time.time() if entry else 0
+        if remaining >= ALGOLIA_KEY_REFRESH:
+            return
+        if time.time() - _algolia_key_attempts.get(key, 0) < ALGOLIA_KEY_RETRY:
+            return
+        if not force and remaining > 0:
+            self._run_in_background(self._fetch_algolia_key(force=True))
+            return
+        # Gleichzeitige Aufrufe teilen sich den laufenden Abruf
+        await cookidoo_flight.do(("algolia_key", *key), self._download_algolia_key)
+
+    async def _download_algolia_key(self) -> str | None:
+        """Key aus der Cookidoo-Suchseite lesen und im Locale-Cache ablegen."""
+        key = (self._country, self._language)
+        search_url = f"https://{_cookidoo_domain(self._country, self._language)}/search/{self._language}"
         try:
             async with self._session.get(search_url) as resp:
                 html = await resp.text()
                 match = re.search(r'"apiKey"\s*:\s*"([A-Za-z0-9+/=]{40,})"', html)
-                if match:
-                    self._algolia_api_key = match.group(1)
-                    log.info(f"Algolia API-Key gefunden ({len(self._algolia_api_key)} chars)")
-                else:
+                if not match:
                     log.warning("Algolia API-Key nicht im HTML gefunden")
+                    return None
         except Exception as e:
             log.warning(f"Algolia Key fetch fehlgeschlagen: {e}")
+            return None
+        finally:
+            # Erst nach dem Abruf setzen: wer währenddessen kommt, wartet auf dieses Ergebnis
+            _algolia_key_attempts[key] = time.time()
+        api_key = match.group(1)
+        valid_until = _algolia_key_valid_until(api_key) or time.time() + ALGOLIA_KEY_TTL
+        algolia_keys.set(key, (api_key, valid_until))
+        log.info(f"Algolia API-Key gefunden ({len(api_key)} chars, gültig noch "
+                 f"{int((valid_until - time.time()) / 60)} Min.) für {self._country}/{self._language}")
+        return api_key
+
+    async def _algolia_post(self, url: str, payload: dict) -> tuple[int, dict | None]:
+        """POST an Algolia mit dem Locale-Key → (Status, JSON bei 200).
+
+        Lehnt Algolia den Key ab (401/403), wird er neu geladen (gedrosselt) und
+        der Request nur mit einem anderen Key wiederholt; ein bald ablaufender
+        Key wird vorab im Hintergrund erneuert.
+        """
+        await self._fetch_algolia_key()
+        http = await algolia_pool.session()
+        for attempt in range(2):
+            sent_key = self._algolia_api_key
+            async with http.post(url, headers=self._algolia_headers(), json=payload) as resp:
+                status = resp.status
+                if status not in (401, 403) or attempt == 1:
+                    return status, (await resp.json() if status == 200 else None)
+            # Hat ein anderer Aufruf den Key inzwischen erneuert, direkt wiederholen
+            if self._algolia_api_key == sent_key:
+                log.info(f"Algolia-Key abgelehnt ({status}), lade neuen Key")
+                await self._fetch_algolia_key(force=True)
+            if self._algolia_api_key == sent_key:
+                # Gedrosselt oder die Seite liefert denselben Key: Wiederholen bringt nichts
+                return status, None
+        return status, None
+
+    def _algolia_cache_key(self, query: str, count: int, filters: str = "",
+                           recipe_type: str = "main") -> AlgoliaQuery:
+        return AlgoliaQuery(query, count, filters, self._language_filter,
+                            recipe_type, self._country, self._language)
+
+    def _pick_search_terms(self, terms: list[str], k: int, count: int,
+                           recipe_type: str = "main") -> list[str]:
+        """Wählt k zufällige Suchbegriffe, bereits gecachte werden bevorzugt.
+
+        So kostet ein zweiter Login innerhalb der Cache-TTL keine Algolia-Anfragen.
+        """
+        k = min(k, len(terms))
+        warm = [t for t in terms if self._algolia_cache_key(t, count, "", recipe_type) in algolia_cache]
+        if len(warm) >= k:
+            return random.sample(warm, k)
+        cold = [t for t in terms if t not in warm]
+        return warm + random.sample(cold, k - len(warm))
 
     async def _search_algolia(self, query: str, count: int = 40,
                                filters: str = "", recipe_type: str = "main") -> list[RecipeInfo]:
+        cache_key = self._algolia_cache_key(query, count, filters, recipe_type)
+        cached = algolia_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         if not self._session or not self._algolia_api_key:
             return []
 
-        headers = {
+        # Identische, gleichzeitige Suchen (auch anderer User) teilen sich einen Request
+        return list(await algolia_flight.do(cache_key, lambda: self._fetch_algolia(cache_key)))
+
+    async def _fetch_algolia(self, key: AlgoliaQuery) -> list[RecipeInfo]:
+        """Ein einzelner Algolia-Request (ohne Cache-Prüfung), Ergebnis wird unter `key` gecacht."""
+        payload = self._algolia_params(key)
+        try:
+            status, data = await self._algolia_post(ALGOLIA_SEARCH_URL, payload)
+            if status != 200:
+                log.warning(f"Algolia '{key.query}' Status {status}")
+                return []
+            recipes = self._parse_hits(data.get("hits", []), key)
+            log.info(f"Algolia '{key.query}' [{key.recipe_type}]: {len(recipes)} Treffer")
+            algolia_cache.set(key, tuple(recipes))
+        except Exception as e:
+            log.warning(f"Algolia Suche Fehler: {e}")
+            return []
+
+        await self._save_to_catalog(recipes, key.recipe_type, "search")
+        return recipes
+
+    def _algolia_headers(self) -> dict:
+        return {
             "X-Algolia-Application-Id": ALGOLIA_APP_ID,
-            "X-Algolia-API-Key": self._algolia_api_key,
+            "X-Algolia-API-Key": self._algolia_api_key or "",
             "Content-Type": "application/json",
         }
-        payload = {"query": query, "hitsPerPage": count}
-        combined_filters = filters
-        if self._language_filter:
-            combined_filters = f"({self._language_filter})" if not combined_filters else f"({combined_filters}) AND ({self._language_filter})"
+
+    @staticmethod
+    def _algolia_params(key: AlgoliaQuery) -> dict:
+        params = {"query": key.query, "hitsPerPage": key.count}
+        combined_filters = key.filters
+        if key.language_filter:
+            combined_filters = f"({key.language_filter})" if not combined_filters else f"({combined_filters}) AND ({key.language_filter})"
         if combined_filters:
-            payload["filters"] = combined_filters
+            params["filters"] = combined_filters
+        return params
+
+    @staticmethod
+    def _parse_hits(hits: list[dict], key: AlgoliaQuery) -> list[RecipeInfo]:
+        recipes = []
+        for hit in hits:
+            recipe = _parse_algolia_hit(hit, key.country, key.language, key.recipe_type)
+            if recipe:
+                recipes.append(recipe)
+        return recipes
+
+    async def _search_algolia_batch(self, queries: list[str], count: int = 40,
+                                    filters: str = "", recipe_type: str = "main") -> list[list[RecipeInfo]]:
+        """Mehrere Suchbegriffe in einem Multi-Query-Request abfragen.
+
+        Gecachte Begriffe werden nicht erneut gesendet. Die Antwort wird pro
+        Begriff zurück in RecipeInfo-Listen aufgeteilt (gleiche Reihenfolge wie
+        `queries`). Schlägt der Batch fehl, wird auf Einzelanfragen zurückgefallen.
+        """
+        # Keys vor dem ersten await bilden: Sprachfilter/Locale gelten für den ganzen Batch
+        all_keys = [self._algolia_cache_key(q, count, filters, recipe_type) for q in queries]
+        results: list[list[RecipeInfo] | None] = [None] * len(queries)
+        missing: list[int] = []
+        for i, key in enumerate(all_keys):
+            cached = algolia_cache.get(key)
+            if cached is not None:
+                results[i] = list(cached)
+            else:
+                missing.append(i)
+
+        if missing and self._session and self._algolia_api_key:
+            keys = [all_keys[i] for i in missing]
+
+            async def fetch(own: list[int]) -> list[list[RecipeInfo]]:
+                return await self._fetch_algolia_batch([keys[i] for i in own])
+
+            # Begriffe, die gerade von einem anderen Aufruf geladen werden, nicht erneut senden
+            for i, recipes in zip(missing, await algolia_flight.do_many(keys, fetch)):
+                results[i] = list(recipes)
+
+        return [r if r is not None else [] for r in results]
+
+    async def _fetch_algolia_batch(self, keys: list[AlgoliaQuery]) -> list[list[RecipeInfo]]:
+        """Keys in Multi-Query-Chunks laden; Ergebnisse werden unter genau diesen Keys gecacht."""
+        results: list[list[RecipeInfo]] = []
+        fetched: list[RecipeInfo] = []
+        for start in range(0, len(keys), ALGOLIA_BATCH_SIZE):
+            chunk = keys[start:start + ALGOLIA_BATCH_SIZE]
+            chunk_results = await self._multi_query(chunk)
+            if chunk_results is None:
+                log.info(f"Algolia Multi-Query fehlgeschlagen, Fallback auf {len(chunk)} Einzelanfragen")
+                chunk_results = await asyncio.gather(*[self._fetch_algolia(key) for key in chunk])
+            else:
+                for key, recipes in zip(chunk, chunk_results):
+                    algolia_cache.set(key, tuple(recipes))
+                    fetched.extend(recipes)
+            results.extend(chunk_results)
+        if keys:
+            await self._save_to_catalog(fetched, keys[0].recipe_type, "search")
+        return results
+
+    async def _multi_query(self, keys: list[AlgoliaQuery]) -> list[list[RecipeInfo]] | None:
+        """Ein Multi-Query-Request; None bei Fehlern oder unerwarteter Antwort."""
+        payload = {
+            "requests": [
+                {"indexName": ALGOLIA_INDEX, "params": urlencode(self._algolia_params(key))}
+                for key in keys
+            ],
+            "strategy": "none",
+        }
+        try:
+            status, data = await self._algolia_post(ALGOLIA_MULTI_QUERY_URL, payload)
+            if status != 200:
+                log.warning(f"Algolia Multi-Query Status {status}")
+                return None
+        except Exception as e:
+            log.warning(f"Algolia Multi-Query Fehler: {e}")
+            return None
+
+        batch = data.get("results")
+        if not isinstance(batch, list) or len(batch) != len(keys):
+            return None
+        parsed = [self._parse_hits(result.get("hits", []), key) for result, key in zip(batch, keys)]
+        log.info(f"Algolia Multi-Query [{keys[0].recipe_type}]: {len(keys)} Begriffe, "
+                 f"{sum(len(p) for p in parsed)} Treffer")
+        return parsed
+
+    async def _save_to_catalog(self, recipes: list[RecipeInfo], recipe_type: str, source: str) -> None:
+        """Write-through in den persistenten Rezeptkatalog (Fehler sind nicht fatal)."""
+        try:
+            await asyncio.to_thread(catalog.save_recipes, recipes, self._country, recipe_type, source)
+        except Exception as e:
+            log.warning(f"Katalog schreiben fehlgeschlagen: {e}")
 
+    async def _warm_from_catalog(self, recipe_type: str) -> list[RecipeInfo]:
+        """Pool aus dem Katalog laden; leer, wenn zu wenige Rezepte vorhanden sind."""
         try:
-            async with self._session.post(ALGOLIA_SEARCH_URL, headers=headers, json=payload) as resp:
-                if resp.status != 200:
-                    return []
-                data = await resp.json()
-                recipes = []
-                for hit in data.get("hits", []):
-                    recipe = _parse_algolia_hit(hit, self._country, self._language, recipe_type)
-                    if recipe:
-                        recipes.append(recipe)
-                log.info(f"Algolia '{query}' [{recipe_type}]: {len(recipes)} Treffer")
-                return recipes
+            rows = await asyncio.to_thread(
+                catalog.load_recipes, self._country, recipe_type, self._languages,
+            )
         except Exception as e:
-            log.warning(f"Algolia Suche Fehler: {e}")
+            log.warning(f"Katalog lesen fehlgeschlagen: {e}")
+            return []
+        if len(rows) < CATALOG_WARM_MIN:
             return []
+        log.info(f"Pool [{recipe_type}] aus Katalog vorgewärmt: {len(rows)} Rezepte")
+        return [_recipe_from_catalog_row(row) for row in rows]
+
+    def _run_in_background(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def _cancel_background(self) -> None:
+        for task in list(self._refresh_tasks):
+            task.cancel()
 
     async def _search_typed_pool(self, search_terms: list[str], recipe_type: str,
                                   count_per_term: int = 30) -> list[RecipeInfo]:
         """Lädt Rezepte eines bestimmten Typs (starter/dessert/main) via Algolia."""
-        terms = random.sample(search_terms, min(10, len(search_terms)))
-        results = await asyncio.gather(
-            *[self._search_algolia(t, count_per_term, recipe_type=recipe_type) for t in terms]
-        )
+        terms = self._pick_search_terms(search_terms, 10, count_per_term, recipe_type)
+        results = await self._search_algolia_batch(terms, count_per_term, recipe_type=recipe_type)
         seen: set[str] = set()
         pool: list[RecipeInfo] = []
         for lst in results:
@@ -317,6 +933,7 @@ class CookidooPlanner:
 
     def _set_language_filter(self, languages: list[str] | None) -> None:
         """Setzt den Algolia-Sprachfilter basierend auf den gewählten Sprachen."""
+        self._languages = list(languages or [])
         if not languages:
             self._language_filter = ""
             return
@@ -331,35 +948,35 @@ class CookidooPlanner:
         preferred_ingredients: list[str] | None = None,
         languages: list[str] | None = None,
     ) -> int:
-        """Lade Hauptgerichte via Algolia mit optionalen Filtern."""
+        """Lade Hauptgerichte via Algolia mit optionalen Filtern.
+
+        Bei unveränderten Filtern wird der bestehende Pool wiederverwendet und
+        nur aufgestockt, wenn er unter SEARCH_POOL_MIN Rezepte fällt.
+        """
         self._set_language_filter(languages)
-        search_terms = list(SEARCH_TERMS)
+        fingerprint = (
+            tuple(sorted(categories or [])),
+            tuple(sorted(cuisines or [])),
+            tuple(sorted(i.strip().lower() for i in preferred_ingredients or [])),
+            tuple(sorted(languages or [])),
+        )
+        if fingerprint == self._filter_fingerprint and self._search_recipes:
+            if len(self._search_recipes) < SEARCH_POOL_MIN:
+                await self._top_up_search_pool()
+            return len(self._search_recipes)
 
-        category_terms = {
-            "vegetarisch": ["vegetarisch", "gemüse", "veggie"],
-            "vegan": ["vegan", "vegane", "pflanzlich"],
-            "low carb": ["low carb", "kohlenhydratarm"],
-            "high protein": ["high protein", "eiweiss", "proteinreich"],
-        }
-        cuisine_terms = {
-            "italienisch": ["italienisch", "pasta", "risotto", "pizza"],
-            "asiatisch": ["asiatisch", "asia", "wok", "thai"],
-            "mexikanisch": ["mexikanisch", "burrito", "taco", "enchilada"],
-            "indisch": ["indisch", "curry", "tikka", "masala"],
-            "mediterran": ["mediterran", "griechisch", "spanisch"],
-            "orientalisch": ["orientalisch", "falafel", "hummus", "couscous"],
-        }
+        search_terms = list(SEARCH_TERMS)
 
         if categories:
             extra = []
             for cat in categories:
-                extra.extend(category_terms.get(cat, [cat]))
+                extra.extend(CATEGORY_TERMS.get(cat, [cat]))
             search_terms = extra + search_terms[:10]
 
         if cuisines:
             extra = []
             for c in cuisines:
-                extra.extend(cuisine_terms.get(c, [c]))
+                extra.extend(CUISINE_TERMS.get(c, [c]))
             search_terms = extra + search_terms[:10]
 
         if preferred_ingredients:
@@ -367,10 +984,10 @@ class CookidooPlanner:
 
         terms_to_use = random.sample(search_terms, min(20, len(search_terms)))
 
+        self._cancel_background()
         self._search_recipes = []
-        results = await asyncio.gather(
-            *[self._search_algolia(term, count=40) for term in terms_to_use]
-        )
+        self._pools_changed()
+        results = await self._search_algolia_batch(terms_to_use, count=40)
         seen_ids = {r.id for r in self._custom_recipes + self._managed_recipes}
         for recipe_list in results:
             for recipe in recipe_list:
@@ -378,32 +995,95 @@ class CookidooPlanner:
                     seen_ids.add(recipe.id)
                     self._search_recipes.append(recipe)
 
+        self._filter_keywords = []
         if categories:
             cat_keywords = []
             for cat in categories:
-                cat_keywords.extend(category_terms.get(cat, [cat]))
-            filtered = [r for r in self._search_recipes
-                        if any(kw.lower() in r.name.lower() for kw in cat_keywords)]
+                cat_keywords.extend(kw.lower() for kw in CATEGORY_TERMS.get(cat, [cat]))
+            pattern = keyword_pattern(tuple(cat_keywords))
+            filtered = [r for r in self._search_recipes if pattern.search(r.name.lower())]
             if len(filtered) >= 10:
                 self._search_recipes = filtered
+                self._filter_keywords = cat_keywords
+        self._pools_changed()
 
+        self._filter_fingerprint = fingerprint
+        self._filter_terms = search_terms
+        self._filter_terms_used = set(terms_to_use)
         log.info(f"Algolia Suche: {len(self._search_recipes)} Hauptgerichte")
         return len(self._search_recipes)
 
+    async def _top_up_search_pool(self) -> None:
+        """Gefilterten Pool mit noch ungenutzten Suchbegriffen aufstocken."""
+        unused = [t for t in self._filter_terms if t not in self._filter_terms_used]
+        if not unused:
+            unused = [t for t in SEARCH_TERMS if t not in self._filter_terms_used]
+        terms = random.sample(unused, min(10, len(unused)))
+        if not terms:
+            return
+        self._filter_terms_used.update(terms)
+        results = await self._search_algolia_batch(terms, count=40)
+        recipes = [r for recipe_list in results for r in recipe_list]
+        if self._filter_keywords:
+            pattern = keyword_pattern(tuple(self._filter_keywords))
+            recipes = [r for r in recipes if pattern.search(r.name.lower())]
+        before = len(self._search_recipes)
+        self._merge_search_recipes(recipes)
+        log.info(f"Algolia Pool aufgestockt: {before} → {len(self._search_recipes)} Hauptgerichte")
+
     async def load_collections(self) -> dict:
         if not self._cookidoo or not self._logged_in:
             raise RuntimeError("Nicht eingeloggt")
 
+        self._cancel_background()
+        if self._enrich_task:
+            self._enrich_task.cancel()
         self._custom_recipes = []
         self._managed_recipes = []
         self._search_recipes = []
         self._starter_recipes = []
         self._dessert_recipes = []
-
-        _, custom_pages = await self._cookidoo.count_custom_collections()
-        custom_collections: list[CookidooCollection] = []
-        for page in range(custom_pages):
-            custom_collections.extend(await self._cookidoo.get_custom_collections(page=page))
+        self._filter_fingerprint = None
+        self._pools_changed()
+
+        # Seiten beider Sammlungsarten und die Algolia-Suche laufen parallel
+        timings: dict[str, int] = {}
+        semaphore = asyncio.BoundedSemaphore(COLLECTION_CONCURRENCY)
+        started = time.perf_counter()
+
+        async def fetch_collections(kind: str, count_pages, get_page) -> list[CookidooCollection]:
+            t0 = time.perf_counter()
+            async with semaphore:
+                _, pages = await count_pages()
+
+            async def fetch_page(page: int) -> list[CookidooCollection]:
+                async with semaphore:
+                    return await get_page(page=page)
+
+            # gather behält die Seitenreihenfolge bei → deterministisches Ergebnis
+            results = await asyncio.gather(*[fetch_page(page) for page in range(pages)])
+            timings[f"{kind}_collections_ms"] = round((time.perf_counter() - t0) * 1000)
+            return [coll for page_colls in results for coll in page_colls]
+
+        async def fetch_search() -> tuple[list[RecipeInfo], str]:
+            # Immer Algolia-Rezepte laden – sie dienen als "neue Rezepte" für den Ratio-Slider.
+            # Kaltstart: zuerst aus dem Katalog vorwärmen und Algolia im Hintergrund nachladen.
+            t0 = time.perf_counter()
+            recipes = await self._warm_from_catalog("main")
+            source = "catalog"
+            if not recipes:
+                recipes = await self._fetch_search_pool()
+                source = "algolia"
+            timings["search_ms"] = round((time.perf_counter() - t0) * 1000)
+            return recipes, source
+
+        custom_collections, managed_collections, (search_recipes, search_source) = await asyncio.gather(
+            fetch_collections("custom", self._cookidoo.count_custom_collections,
+                              self._cookidoo.get_custom_collections),
+            fetch_collections("managed", self._cookidoo.count_managed_collections,
+                              self._cookidoo.get_managed_collections),
+            fetch_search(),
+        )
 
         for coll in custom_collections:
             for chapter in coll.chapters:
@@ -413,11 +1093,6 @@ class CookidooPlanner:
                         source="custom", collection_name=coll.name,
                     ))
 
-        _, managed_pages = await self._cookidoo.count_managed_collections()
-        managed_collections: list[CookidooCollection] = []
-        for page in range(managed_pages):
-            managed_collections.extend(await self._cookidoo.get_managed_collections(page=page))
-
         for coll in managed_collections:
             for chapter in coll.chapters:
                 for recipe in chapter.recipes:
@@ -426,75 +1101,237 @@ class CookidooPlanner:
                         source="managed", collection_name=coll.name,
                     ))
 
-        # Immer Algolia-Rezepte laden – sie dienen als "neue Rezepte" für den Ratio-Slider
-        log.info(f"Sammlungen: {len(self._custom_recipes)} eigene, {len(self._managed_recipes)} verwaltete. Starte Algolia-Suche...")
-        search_terms = random.sample(SEARCH_TERMS, min(20, len(SEARCH_TERMS)))
-        results = await asyncio.gather(
-            *[self._search_algolia(term, count=40) for term in search_terms]
+        await self._fill_ingredients_from_catalog(self._custom_recipes + self._managed_recipes)
+        self._pools_changed()
+        self._merge_search_recipes(search_recipes)
+        if search_source == "catalog":
+            self._run_in_background(self._refresh_search_pool())
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000)
+        log.info(f"Sammlungen: {len(self._custom_recipes)} eigene, {len(self._managed_recipes)} verwaltete, "
+                 f"{len(self._search_recipes)} Algolia ({search_source}), Zeiten: {timings}")
+
+        await self._save_to_catalog(self._custom_recipes + self._managed_recipes, "main", "collection")
+
+        # Bilder (und fehlende Zutaten) der Sammlungsrezepte im Hintergrund vorwärmen
+        self._enrich_task = asyncio.create_task(
+            self.enrich_recipes(self._custom_recipes + self._managed_recipes)
         )
-        seen_ids = {r.id for r in self._custom_recipes + self._managed_recipes}
-        for recipe_list in results:
-            for recipe in recipe_list:
-                if recipe.id not in seen_ids:
-                    seen_ids.add(recipe.id)
-                    self._search_recipes.append(recipe)
 
         return {
             "custom_recipes": len(self._custom_recipes),
             "managed_recipes": len(self._managed_recipes),
             "search_recipes": len(self._search_recipes),
+            "search_source": search_source,
             "custom_collections": len(custom_collections),
             "managed_collections": len(managed_collections),
+            "timings": timings,
         }
 
+    def _merge_search_recipes(self, recipes: list[RecipeInfo]) -> None:
+        """Neue Algolia-Rezepte ohne Duplikate in den Such-Pool übernehmen."""
+        seen_ids = {r.id for r in self._custom_recipes + self._managed_recipes + self._search_recipes}
+        before = len(self._search_recipes)
+        for recipe in recipes:
+            if recipe.id not in seen_ids:
+                seen_ids.add(recipe.id)
+                self._search_recipes.append(recipe)
+        if len(self._search_recipes) != before:
+            self._pools_changed()
+
+    async def _fetch_search_pool(self) -> list[RecipeInfo]:
+        search_terms = self._pick_search_terms(SEARCH_TERMS, 20, 40)
+        results = await self._search_algolia_batch(search_terms, count=40)
+        return [r for recipe_list in results for r in recipe_list]
+
+    async def _refresh_search_pool(self) -> None:
+        self._merge_search_recipes(await self._fetch_search_pool())
+
+    async def _fill_ingredients_from_catalog(self, recipes: list[RecipeInfo]) -> None:
+        """Zutaten von Rezepten ohne Zutatenfelder (Sammlungen) aus dem Katalog übernehmen."""
+        missing = [r for r in recipes if not r.ingredients]
+        if not missing:
+            return
+        try:
+            known = await asyncio.to_thread(
+                catalog.load_recipe_ingredients, self._country, [r.id for r in missing],
+            )
+        except Exception as e:
+            log.warning(f"Katalog lesen fehlgeschlagen: {e}")
+            return
+        for r in missing:
+            if r.id in known:
+                r.ingredients = _catalog_ingredients(known[r.id])
+        log.info(f"Zutaten aus Katalog: {sum(r.id in known for r in missing)}/{len(missing)} Sammlungsrezepte")
+
+    async def _fetch_recipe_media(self, recipe_id: str, with_ingredients: bool = False) -> tuple | None:
+        """Bild/URL/Zutaten eines Rezepts: Speicher-Cache → Katalog → get_recipe_details.
+
+        Gibt (thumbnail, image, url, ingredients, neu_geladen) zurück oder None.
+        Mit `with_ingredients` zählen Cache/Katalog nur, wenn sie Zutaten kennen.
+        """
+        key = (self._country, recipe_id)
+        cached = recipe_details_cache.get(key)
+        if cached is not None and (cached[3] or not with_ingredients):
+            return (*cached, False)
+        try:
+            row = await asyncio.to_thread(catalog.get_recipe_media, recipe_id, self._country)
+        except Exception as e:
+            log.warning(f"Katalog lesen fehlgeschlagen: {e}")
+            row = None
+        if row and (row["ingredients"] or not with_ingredients):
+            media = (row["thumbnail"], row["image"], row["url"], _catalog_ingredients(row["ingredients"]))
+            recipe_details_cache.set(key, media)
+            return (*media, False)
+        if not self._cookidoo:
+            return None
+        try:
+            details = await cookidoo_flight.do(
+                ("details", self._country, recipe_id),
+                lambda: self._cookidoo.get_recipe_details(recipe_id),
+            )
+        except Exception as e:
+            log.warning(f"Rezeptdetails für {recipe_id} fehlgeschlagen: {e}")
+            return None
+        ingredients = _normalize_ingredients(i.name for i in details.ingredients or [])
+        media = (details.thumbnail, details.image, details.url, ingredients)
+        recipe_details_cache.set(key, media)
+        return (*media, True)
+
+    @staticmethod
+    def _apply_media(recipe: RecipeInfo, media: tuple) -> bool:
+        """Details übernehmen; True, wenn das Rezept dabei erstmals Zutaten bekommt."""
+        thumbnail, image, url, ingredients = media[:4]
+        recipe.thumbnail = thumbnail
+        recipe.image = image
+        recipe.url = url or recipe.url
+        if ingredients and not recipe.ingredients:
+            recipe.ingredients = tuple(sys.intern(i) for i in ingredients)
+            return True
+        return False
+
     async def _enrich_recipe(self, recipe: RecipeInfo) -> RecipeInfo:
         if recipe.thumbnail and recipe.image:
             return recipe
-        if not self._cookidoo:
-            return recipe
-        try:
-            details = await self._cookidoo.get_recipe_details(recipe.id)
-            recipe.thumbnail = details.thumbnail
-            recipe.image = details.image
-            recipe.url = details.url
-        except Exception:
-            pass
+        media = await self._fetch_recipe_media(recipe.id)
+        if media:
+            if self._apply_media(recipe, media):
+                self._pools_changed()
+            if media[4]:
+                await self._persist_media([recipe])
         return recipe
 
-    @staticmethod
-    def _filter_by_time(recipes: list[RecipeInfo], max_minutes: int | None) -> list[RecipeInfo]:
-        if max_minutes is None:
-            return recipes
-        max_seconds = max_minutes * 60
-        return [r for r in recipes if r.total_time == 0 or r.total_time <= max_seconds]
+    async def _persist_media(self, recipes: list[RecipeInfo]) -> None:
+        try:
+            await asyncio.to_thread(
+                catalog.update_recipe_media, self._country,
+                [(r.id, r.thumbnail, r.image, r.url, r.ingredients) for r in recipes],
+            )
+        except Exception as e:
+            log.warning(f"Katalog schreiben fehlgeschlagen: {e}")
+
+    async def enrich_recipes(self, recipes: list[RecipeInfo],
+                             concurrency: int = ENRICH_CONCURRENCY) -> int:
+        """Rezepte ohne Bild oder Zutaten gebündelt anreichern (max. `concurrency` parallel).
+
+        Neu geladene Details landen im Cache und im Katalog, damit
+        generate_plan später nicht auf Detail-Anfragen warten muss. Kommen
+        dabei Zutaten hinzu, wird der Pool-Index einmal neu aufgebaut.
+        Gibt die Anzahl angereicherter Rezepte zurück.
+        """
+        todo = {r.id: r for r in recipes if not (r.thumbnail and r.image and r.ingredients)}
+        if not todo:
+            return 0
+        semaphore = asyncio.Semaphore(concurrency)
+        fetched: list[RecipeInfo] = []
+        gained = 0
+
+        async def enrich(recipe: RecipeInfo) -> bool:
+            nonlocal gained
+            async with semaphore:
+                media = await self._fetch_recipe_media(recipe.id, with_ingredients=not recipe.ingredients)
+            if not media:
+                return False
+            gained += self._apply_media(recipe, media)
+            if media[4]:
+                fetched.append(recipe)
+            return True
+
+        results = await asyncio.gather(*[enrich(r) for r in todo.values()])
+        # Gleiche Rezept-ID kann mehrfach vorkommen (mehrere Sammlungen)
+        for r in recipes:
+            done = todo.get(r.id)
+            if done is not None and r is not done and done.image:
+                gained += self._apply_media(r, (done.thumbnail, done.image, done.url, done.ingredients))
+        if gained:
+            self._pools_changed()
+        await self._persist_media(fetched)
+        enriched = sum(results)
+        log.info(f"Anreicherung: {enriched}/{len(todo)} Rezepte ({len(fetched)} neu geladen, "
+                 f"{gained} mit neuen Zutaten)")
+        return enriched
+
+    def _pools_changed(self) -> None:
+        """Nach jedem Ersetzen/Erweitern einer Rezeptliste aufrufen (Pool-Index, Snapshot)."""
+        self._pools_version += 1
+
+    def _get_pool(self) -> RecipePool:
+        """Gibt den vorindizierten Pool zurück und baut ihn bei Änderungen neu auf."""
+        if self._pool is None or self._pool_version != self._pools_version:
+            self._pool = RecipePool({
+                "main": self._custom_recipes + self._managed_recipes + self._search_recipes,
+                "starter": self._starter_recipes,
+                "dessert": self._dessert_recipes,
+            })
+            self._pool_version = self._pools_version
+        return self._pool
 
     @staticmethod
-    def _filter_by_ingredients(recipes: list[RecipeInfo], exclude_ingredients: list[str] | None) -> list[RecipeInfo]:
-        if not exclude_ingredients:
-            return recipes
-        exclude_lower = [i.lower().strip() for i in exclude_ingredients if i.strip()]
-        if not exclude_lower:
-            return recipes
-        return [r for r in recipes if not any(excl in r.name.lower() for excl in exclude_lower)]
-
-    def _get_pool_for_slot(self, slot_key: str) -> list[RecipeInfo]:
-        """Gibt den Recipe-Pool für einen Slot zurück."""
+    def _slot_type(slot_key: str) -> str:
         if slot_key in ("m_v", "a_v"):
-            return self._starter_recipes
-        elif slot_key in ("m_d", "a_d"):
-            return self._dessert_recipes
-        else:  # "m", "a"
-            return self._custom_recipes + self._managed_recipes + self._search_recipes
+            return "starter"
+        if slot_key in ("m_d", "a_d"):
+            return "dessert"
+        return "main"
+
+    async def _load_typed_pool(self, search_terms: list[str], recipe_type: str) -> list[RecipeInfo]:
+        """Typ-Pool laden: aus dem Katalog (plus Algolia im Hintergrund) oder direkt via Algolia."""
+        pool = await self._warm_from_catalog(recipe_type)
+        if not pool:
+            return await self._search_typed_pool(search_terms, recipe_type)
+
+        async def refresh():
+            seen = {r.id for r in pool}
+            for r in await self._search_typed_pool(search_terms, recipe_type):
+                if r.id not in seen:
+                    seen.add(r.id)
+                    pool.append(r)
+            self._pools_changed()
+
+        self._run_in_background(refresh())
+        return pool
 
     async def _ensure_starter_pool(self):
         if not self._starter_recipes:
-            self._starter_recipes = await self._search_typed_pool(STARTER_SEARCH_TERMS, "starter")
-            log.info(f"Vorspeisen-Pool geladen: {len(self._starter_recipes)}")
+            # Single-flight: parallele Aufrufe (z.B. Doppelklick) laden den Pool nur einmal
+            pool = await cookidoo_flight.do(
+                ("pool", id(self), "starter"),
+                lambda: self._load_typed_pool(STARTER_SEARCH_TERMS, "starter"),
+            )
+            if not self._starter_recipes:
+                self._starter_recipes = pool
+                self._pools_changed()
+                log.info(f"Vorspeisen-Pool geladen: {len(self._starter_recipes)}")
 
     async def _ensure_dessert_pool(self):
         if not self._dessert_recipes:
-            self._dessert_recipes = await self._search_typed_pool(DESSERT_SEARCH_TERMS, "dessert")
-            log.info(f"Dessert-Pool geladen: {len(self._dessert_recipes)}")
+            pool = await cookidoo_flight.do(
+                ("pool", id(self), "dessert"),
+                lambda: self._load_typed_pool(DESSERT_SEARCH_TERMS, "dessert"),
+            )
+            if not self._dessert_recipes:
+                self._dessert_recipes = pool
+                self._pools_changed()
+                log.info(f"Dessert-Pool geladen: {len(self._dessert_recipes)}")
 
     async def generate_plan(
         self,
@@ -524,9 +1361,8 @@ class CookidooPlanner:
         if any(sk in ("m_d", "a_d") for sk in all_slot_keys):
             await self._ensure_dessert_pool()
 
+        pool = self._get_pool()
         exclude = set(exclude_ids or [])
-        seen_global: set[str] = set()
-        exclude_ingr = exclude_ingredients or []
 
         # Plan-Struktur initialisieren
         plan: dict[str, dict[str, RecipeInfo | None]] = {}
@@ -550,40 +1386,35 @@ class CookidooPlanner:
             n = len(days_for_slot)
             max_time = max_time_per_slot.get(time_key(slot_key))
 
-            base_pool = self._get_pool_for_slot(slot_key)
-            filtered = self._filter_by_time(base_pool, max_time)
-            filtered = self._filter_by_ingredients(filtered, exclude_ingr)
-            available = [r for r in filtered if r.id not in exclude and r.id not in seen_global]
+            slot_type = self._slot_type(slot_key)
 
-            if slot_key in ("m", "a"):
+            if slot_type == "main":
                 # Custom-Ratio für Hauptgänge
                 # "eigene" = aus Cookidoo-Sammlungen (custom + managed), "neue" = Algolia-Suche
-                available_custom = [r for r in available if r.source in ("custom", "managed")]
-                available_other = [r for r in available if r.source not in ("custom", "managed")]
+                n_available_custom = pool.count("main", OWN_SOURCES, max_time, exclude, exclude_ingredients)
+                n_available_other = pool.count("main", OTHER_SOURCES, max_time, exclude, exclude_ingredients)
 
                 n_custom = round(n * custom_ratio / 100)
                 n_other = n - n_custom
 
-                if len(available_custom) < n_custom:
-                    n_custom = len(available_custom)
+                if n_available_custom < n_custom:
+                    n_custom = n_available_custom
                     n_other = n - n_custom
-                if len(available_other) < n_other:
-                    n_other = len(available_other)
-                    n_custom = min(len(available_custom), n - n_other)
+                if n_available_other < n_other:
+                    n_other = n_available_other
+                    n_custom = min(n_available_custom, n - n_other)
 
-                selected = (
-                    random.sample(available_custom, min(n_custom, len(available_custom)))
-                    + random.sample(available_other, min(n_other, len(available_other)))
-                )
+                selected = pool.sample("main", n_custom, OWN_SOURCES, max_time, exclude, exclude_ingredients)
+                exclude.update(r.id for r in selected)
+                selected += pool.sample("main", n_other, OTHER_SOURCES, max_time, exclude, exclude_ingredients)
             else:
                 # Vorspeise/Dessert: einfach zufällig
-                selected = random.sample(available, min(n, len(available)))
+                selected = pool.sample(slot_type, n, None, max_time, exclude, exclude_ingredients)
 
             random.shuffle(selected)
             enriched = await asyncio.gather(*[self._enrich_recipe(r) for r in selected])
 
-            for r in enriched:
-                seen_global.add(r.id)
+            exclude.update(r.id for r in enriched)
 
             for i, (day_idx, day_name) in enumerate(days_for_slot):
                 plan[day_name][slot_key] = enriched[i] if i < len(enriched) else None
@@ -604,94 +1435,153 @@ class CookidooPlanner:
         # Sicherstellen dass der Pool geladen ist
         if slot_type == "starter":
             await self._ensure_starter_pool()
-            base_pool = self._starter_recipes
         elif slot_type == "dessert":
             await self._ensure_dessert_pool()
-            base_pool = self._dessert_recipes
         else:
-            base_pool = self._custom_recipes + self._managed_recipes + self._search_recipes
+            slot_type = "main"
 
+        pool = self._get_pool()
         exclude = set(exclude_ids or [])
-        filtered = self._filter_by_time(base_pool, max_time_minutes)
-        filtered = self._filter_by_ingredients(filtered, exclude_ingredients or [])
-        available = [r for r in filtered if r.id not in exclude]
 
         if slot_type == "main":
             # "eigene" = aus Cookidoo-Sammlungen (custom + managed), "neue" = Algolia-Suche
-            available_custom = [r for r in available if r.source in ("custom", "managed")]
-            available_other = [r for r in available if r.source not in ("custom", "managed")]
             use_custom = random.randint(1, 100) <= custom_ratio
-            if use_custom and available_custom:
-                recipe = random.choice(available_custom)
-            elif available_other:
-                recipe = random.choice(available_other)
-            elif available_custom:
-                recipe = random.choice(available_custom)
-            else:
-                return None
+            order = [OWN_SOURCES, OTHER_SOURCES] if use_custom else [OTHER_SOURCES, OWN_SOURCES]
+            picked: list[RecipeInfo] = []
+            for sources in order:
+                picked = pool.sample("main", 1, sources, max_time_minutes, exclude, exclude_ingredients)
+                if picked:
+                    break
         else:
-            if not available:
+            picked = pool.sample(slot_type, 1, None, max_time_minutes, exclude, exclude_ingredients)
+
+        if not picked:
+            return None
+        return await self._enrich_recipe(picked[0])
+
+    async def _ingredient_facet(self) -> str | None:
+        """Facet-Attribut für Zutaten (prozessweit gecacht), "" wenn der Index keines hat.
+
+        Beim ersten Bedarf pro (Index, Sprache) werden die Kandidaten einmal
+        geprobt; None heisst: Erkennung gerade nicht möglich (Netzwerk).
+        Ein abgelaufener Wert wird weiter geliefert und im Hintergrund erneuert.
+        """
+        key = (ALGOLIA_INDEX, self._language)
+        facet, fresh = ingredient_facets.get_stale(key)
+        if facet is not None:
+            if not fresh:
+                self._refresh_facet(key)
+            return facet
+        if not self._algolia_api_key:
+            return None
+        return await self._discover_facet(key)
+
+    def _refresh_facet(self, key: tuple[str, str]) -> bool:
+        """Facet im Hintergrund neu proben, höchstens einmal pro Minute und Key."""
+        if time.time() - _facet_refresh_attempts.get(key, 0) < 60:
+            return False
+        _facet_refresh_attempts[key] = time.time()
+        task = asyncio.create_task(self._discover_facet(key))
+        _facet_refresh_tasks.add(task)
+        task.add_done_callback(_facet_refresh_tasks.discard)
+        return True
+
+    async def _discover_facet(self, key: tuple[str, str]) -> str | None:
+        """Facet-Kandidaten proben (single-flight pro Key) und das Ergebnis cachen."""
+
+        async def discover() -> str | None:
+            base = f"https://{ALGOLIA_APP_ID}-dsn.algolia.net/1/indexes/{ALGOLIA_INDEX}"
+            failed = False
+            for facet_name in FACET_CANDIDATES:
+                try:
+                    status, _ = await self._algolia_post(
+                        f"{base}/facets/{facet_name}/query",
+                        {"facetQuery": "", "maxFacetHits": 1},
+                    )
+                    if status == 200:
+                        log.info(f"Ingredient-Facet gefunden: '{facet_name}' ({self._language})")
+                        ingredient_facets.set(key, facet_name)
+                        return facet_name
+                    # Key abgelehnt oder Serverfehler sagt nichts über den Facet aus
+                    failed = failed or status in (401, 403) or status >= 500
+                except Exception as e:
+                    failed = True
+                    log.debug(f"Facet '{facet_name}' fehlgeschlagen: {e}")
+            if failed:
                 return None
-            recipe = random.choice(available)
+            log.info(f"Kein Ingredient-Facet verfügbar ({self._language}), nutze Fallback")
+            ingredient_facets.set(key, "")
+            return ""
+
+        return await algolia_flight.do(("facet", *key), discover)
+
+    async def _ingredient_index(self) -> IngredientIndex:
+        """Präfix-Index der aktuellen Sprache, beim ersten Zugriff aus dem Katalog befüllt."""
+        language = self._language.split("-")[0]
+        index = ingredient_indexes.get(language)
+        if index is not None:
+            return index
+
+        async def build() -> IngredientIndex:
+            built = IngredientIndex()
+            try:
+                built.add_many(await asyncio.to_thread(catalog.load_ingredient_counts, language))
+            except Exception as e:
+                log.warning(f"Zutaten-Index aus Katalog fehlgeschlagen: {e}")
+            log.info(f"Zutaten-Index '{language}': {len(built)} Namen aus dem Katalog")
+            return built
 
-        return await self._enrich_recipe(recipe)
+        index = await cookidoo_flight.do(("ingredient_index", language), build)
+        return ingredient_indexes.setdefault(language, index)
 
     async def ingredient_suggestions(self, query: str, limit: int = 10) -> dict:
-        """Suche Zutaten via Algolia.
+        """Suche Zutaten, zuerst im lokalen Präfix-Index, sonst via Algolia.
 
         Strategie:
+        0. Lokaler Index: bekannte Präfixe oder genug lokale Treffer → ohne Netzwerk.
         1. Facet-Suche auf möglichen Attributnamen (mit Caching des funktionierenden).
         2. Reguläre Suche mit Attributen aus dem Hit (ingredientNames-Feld im Rezept).
         3. Fallback: Wort-Extraktion aus Rezepttiteln.
+
+        Treffer aus 1. und 2. fliessen zurück in den lokalen Index.
         """
         q = query.strip()
-        if not self._session or not self._algolia_api_key or len(q) < 2:
+        if len(q) < 2:
             return {"count": 0, "suggestions": []}
 
-        headers = {
-            "X-Algolia-Application-Id": ALGOLIA_APP_ID,
-            "X-Algolia-API-Key": self._algolia_api_key,
-            "Content-Type": "application/json",
-        }
-        base = f"https://{ALGOLIA_APP_ID}-dsn.algolia.net/1/indexes/recipes-production"
-
-        # ── 1. Facet-Suche ──────────────────────────────────────────────────────
-        # Kandidaten in absteigender Wahrscheinlichkeit; bereits bekannter Facet zuerst
-        if self._ingredient_facet:
-            facet_candidates = [self._ingredient_facet]
-        elif self._ingredient_facet is None:
-            facet_candidates = [
-                "ingredientNames", "ingredients", "ingredient",
-                "ingredientList", "zutaten",
-            ]
-        else:
-            facet_candidates = []  # "" = bereits als nicht verfügbar bestätigt
+        # ── 0. Lokaler Präfix-Index ─────────────────────────────────────────────
+        index = await self._ingredient_index()
+        count, suggestions = index.search(q, limit)
+        if index.is_warm(q) or len(suggestions) >= limit:
+            index.local_hits += 1
+            return {"count": count, "suggestions": suggestions}
 
-        for facet_name in facet_candidates:
+        if not self._session or not self._algolia_api_key:
+            return {"count": count, "suggestions": suggestions}
+        index.remote_lookups += 1
+
+        base = f"https://{ALGOLIA_APP_ID}-dsn.algolia.net/1/indexes/{ALGOLIA_INDEX}"
+
+        # ── 1. Facet-Suche (Attribut prozessweit erkannt) ───────────────────────
+        facet_name = await self._ingredient_facet()
+        if facet_name:
             try:
-                url = f"{base}/facets/{facet_name}/query"
-                async with self._session.post(
-                    url, headers=headers,
-                    json={"facetQuery": q, "maxFacetHits": limit},
-                ) as resp:
-                    if resp.status == 200:
-                        if not self._ingredient_facet:
-                            self._ingredient_facet = facet_name
-                            log.info(f"Ingredient-Facet gefunden: '{facet_name}'")
-                        data = await resp.json()
-                        hits = data.get("facetHits", [])
-                        return {
-                            "count": sum(h.get("count", 1) for h in hits),
-                            "suggestions": [h["value"] for h in hits],
-                        }
+                status, data = await self._algolia_post(
+                    f"{base}/facets/{facet_name}/query",
+                    {"facetQuery": q, "maxFacetHits": limit},
+                )
+                if status == 200:
+                    hits = data.get("facetHits", [])
+                    for h in hits:
+                        index.add(h["value"], h.get("count", 1), display=h["value"])
+                    # Weniger Treffer als angefragt → Präfix vollständig bekannt
+                    index.mark_answered(q, complete=len(hits) < limit)
+                    # Antwort aus dem Index: Facet-Treffer plus bekannte Katalog-Zutaten
+                    count, suggestions = index.search(q, limit)
+                    return {"count": count, "suggestions": suggestions}
             except Exception as e:
                 log.debug(f"Facet '{facet_name}' fehlgeschlagen: {e}")
 
-        # Alle Kandidaten erfolglos → kein Facet verfügbar
-        if self._ingredient_facet is None:
-            self._ingredient_facet = ""
-            log.info("Kein Ingredient-Facet verfügbar, nutze Fallback")
-
         # ── 2. Reguläre Suche: Zutaten-Felder aus den Hits ──────────────────────
         try:
             payload = {
@@ -702,41 +1592,47 @@ class CookidooPlanner:
                     "ingredientList", "mainIngredient",
                 ],
             }
-            async with self._session.post(ALGOLIA_SEARCH_URL, headers=headers, json=payload) as resp:
-                if resp.status != 200:
-                    return {"count": 0, "suggestions": []}
-                data = await resp.json()
-                nb_hits = data.get("nbHits", 0)
-                hits = data.get("hits", [])
-                q_lower = q.lower()
-
-                # Zutaten aus dedizierten Feldern sammeln
-                ingredient_freq: dict[str, int] = {}
-                for hit in hits:
-                    for field in ("ingredientNames", "ingredientList"):
-                        val = hit.get(field)
-                        if isinstance(val, list):
-                            for item in val:
-                                name = item if isinstance(item, str) else (
-                                    item.get("name") or item.get("title") or "" if isinstance(item, dict) else ""
-                                )
-                                if name and q_lower in name.lower():
-                                    ingredient_freq[name] = ingredient_freq.get(name, 0) + 1
-
-                if ingredient_freq:
-                    sorted_ingr = sorted(ingredient_freq, key=lambda x: (-ingredient_freq[x], len(x)))
-                    return {"count": nb_hits, "suggestions": sorted_ingr[:limit]}
-
-                # ── 3. Letzter Fallback: Wörter aus Rezepttiteln ──────────────
-                word_freq: dict[str, int] = {}
-                for hit in hits:
-                    for word in hit.get("title", "").split():
-                        w = word.strip("()[],.:-/–—»«'\"!?;")
-                        if len(w) >= len(q) and q_lower in w.lower():
-                            word_freq[w] = word_freq.get(w, 0) + 1
-
-                sorted_words = sorted(word_freq, key=lambda x: (-word_freq[x], len(x)))
-                return {"count": nb_hits, "suggestions": sorted_words[:limit]}
+            status, data = await self._algolia_post(ALGOLIA_SEARCH_URL, payload)
+            if status != 200:
+                return {"count": 0, "suggestions": []}
+            nb_hits = data.get("nbHits", 0)
+            hits = data.get("hits", [])
+            q_lower = q.lower()
+
+            # Zutaten aus dedizierten Feldern sammeln
+            ingredient_freq: dict[str, int] = {}
+            for hit in hits:
+                for field in ("ingredientNames", "ingredientList"):
+                    val = hit.get(field)
+                    if isinstance(val, list):
+                        for item in val:
+                            name = _ingredient_name(item)
+                            if name and q_lower in name.lower():
+                                ingredient_freq[name] = ingredient_freq.get(name, 0) + 1
+
+            if ingredient_freq:
+                for name, freq in ingredient_freq.items():
+                    index.add(name, freq, display=name)
+                # Substring-Treffer ("wiebel" → "Zwiebel") findet der Präfix-Index nicht
+                if index.search(q, limit)[1]:
+                    index.mark_answered(q)
+                sorted_ingr = sorted(ingredient_freq, key=lambda x: (-ingredient_freq[x], len(x)))
+                return {"count": nb_hits, "suggestions": sorted_ingr[:limit]}
+
+            if suggestions:
+                index.mark_answered(q)
+                return {"count": count, "suggestions": suggestions}
+
+            # ── 3. Letzter Fallback: Wörter aus Rezepttiteln ──────────────
+            word_freq: dict[str, int] = {}
+            for hit in hits:
+                for word in hit.get("title", "").split():
+                    w = word.strip("()[],.:-/–—»«'\"!?;")
+                    if len(w) >= len(q) and q_lower in w.lower():
+                        word_freq[w] = word_freq.get(w, 0) + 1
+
+            sorted_words = sorted(word_freq, key=lambda x: (-word_freq[x], len(x)))
+            return {"count": nb_hits, "suggestions": sorted_words[:limit]}
 
         except Exception as e:
             log.warning(f"Ingredient suggestions Fehler: {e}")
@@ -744,18 +1640,51 @@ class CookidooPlanner:
 
     async def save_to_calendar(
         self, plan: dict[str, dict[str, dict]], week_offset: int = 0,
-        add_to_shopping_list: bool = False,
+        add_to_shopping_list: bool = False, progress: Callable[[int, int], None] | None = None,
     ) -> dict:
         if not self._cookidoo or not self._logged_in:
             raise RuntimeError("Nicht eingeloggt")
+        return await self._write_plan(plan, self._week_monday(week_offset), None, add_to_shopping_list, progress)
 
+    async def sync_calendar_week(
+        self, plan: dict[str, dict[str, dict]], week_offset: int = 0,
+        add_to_shopping_list: bool = False, progress: Callable[[int, int], None] | None = None,
+    ) -> dict:
+        """Woche auf den Plan abgleichen (Ersatz für Leeren + Speichern).
+
+        Liest die Woche einmal und schreibt nur die Differenz: fehlende Rezepte
+        hinzufügen, nicht mehr geplante entfernen. Ein fast unveränderter Plan
+        kostet so einen Lesezugriff und wenige Schreibzugriffe.
+        """
+        if not self._cookidoo or not self._logged_in:
+            raise RuntimeError("Nicht eingeloggt")
+        monday = self._week_monday(week_offset)
+        calendar_days = await self._cookidoo.get_recipes_in_calendar_week(monday)
+        existing = {i: {recipe.id for recipe in cal_day.recipes} for i, cal_day in enumerate(calendar_days)}
+        return await self._write_plan(plan, monday, existing, add_to_shopping_list, progress)
+
+    @staticmethod
+    def _week_monday(week_offset: int) -> date:
         today = date.today()
-        monday = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+        return today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+
+    async def _write_plan(
+        self, plan: dict[str, dict[str, dict]], monday: date,
+        existing: dict[int, set[str]] | None, add_to_shopping_list: bool,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> dict:
+        """Plan in den Kalender schreiben.
 
+        Mit `existing` ({Tag-Index: Rezept-IDs im Kalender}) nur die Differenz,
+        sonst alle Rezepte des Plans hinzufügen. `progress(done, total)` wird
+        nach jeder Kalender-Operation und nach der Einkaufsliste aufgerufen.
+        """
         saved = []
         errors = []
         recipe_ids_for_shopping = []
 
+        days = []
+        planned: dict[int, set[str]] = {}
         for day_name, slots in plan.items():
             if not slots:
                 continue
@@ -769,15 +1698,56 @@ class CookidooPlanner:
 
             if not recipe_ids:
                 continue
+            planned[day_idx] = set(recipe_ids)
+            if existing is not None:
+                present = existing.get(day_idx, set())
+                recipe_ids = [rid for rid in recipe_ids if rid not in present]
+            days.append((day_name, slots, target_date, recipe_ids))
+
+        removals = []
+        for day_idx, present in (existing or {}).items():
+            for rid in sorted(present - planned.get(day_idx, set())):
+                removals.append((WEEKDAYS_DE[day_idx], monday + timedelta(days=day_idx), rid))
+
+        # Alle Tage gleichzeitig schreiben, Auswertung in Plan-Reihenfolge
+        adds = [(i, target_date, ids) for i, (_, _, target_date, ids) in enumerate(days) if ids]
+        done = 0
+        total = len(adds) + len(removals) + (1 if add_to_shopping_list else 0)
+
+        def step():
+            nonlocal done
+            done += 1
+            if progress:
+                progress(done, total)
+
+        if progress:
+            progress(0, total)
+        results = await self._run_calendar_ops([
+            lambda d=target_date, ids=ids: self._cookidoo.add_recipes_to_calendar(d, ids)
+            for _, target_date, ids in adds
+        ] + [
+            lambda d=target_date, rid=rid: self._cookidoo.remove_recipe_from_calendar(d, rid)
+            for _, target_date, rid in removals
+        ], on_done=step)
+        day_results = [None] * len(days)
+        for (i, _, _), result in zip(adds, results):
+            day_results[i] = result
+
+        for (day_name, slots, _, _), result in zip(days, day_results):
+            if isinstance(result, Exception):
+                errors.append({"day": day_name, "error": str(result)})
+                continue
+            for slot_key, r in slots.items():
+                if r is not None:
+                    saved.append({"day": day_name, "slot": slot_key, "recipe": r["name"]})
+                    recipe_ids_for_shopping.append(r["id"])
 
-            try:
-                await self._cookidoo.add_recipes_to_calendar(target_date, recipe_ids)
-                for slot_key, r in slots.items():
-                    if r is not None:
-                        saved.append({"day": day_name, "slot": slot_key, "recipe": r["name"]})
-                        recipe_ids_for_shopping.append(r["id"])
-            except Exception as e:
-                errors.append({"day": day_name, "error": str(e)})
+        removed = 0
+        for (day_name, _, _), result in zip(removals, results[len(adds):]):
+            if isinstance(result, Exception):
+                errors.append({"day": day_name, "error": str(result)})
+            else:
+                removed += 1
 
         shopping_added = 0
         if add_to_shopping_list and recipe_ids_for_shopping:
@@ -786,29 +1756,107 @@ class CookidooPlanner:
                 shopping_added = len(items)
             except Exception as e:
                 errors.append({"day": "Einkaufsliste", "error": str(e)})
+        if add_to_shopping_list:
+            step()
 
-        return {"saved": saved, "errors": errors, "shopping_added": shopping_added}
+        added = sum(len(ids) for (_, _, ids), result in zip(adds, results) if not isinstance(result, Exception))
+        log.info(f"Kalender: {added} hinzugefügt, {removed} entfernt, {len(saved) - added} unverändert")
+        return {"saved": saved, "errors": errors, "shopping_added": shopping_added,
+                "added": added, "removed": removed}
 
     async def clear_calendar_week(self, week_offset: int = 0) -> int:
         if not self._cookidoo or not self._logged_in:
             raise RuntimeError("Nicht eingeloggt")
 
-        today = date.today()
-        monday = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+        monday = self._week_monday(week_offset)
         calendar_days = await self._cookidoo.get_recipes_in_calendar_week(monday)
-        removed = 0
 
-        for i, cal_day in enumerate(calendar_days):
-            target_date = monday + timedelta(days=i)
-            for recipe in cal_day.recipes:
+        results = await self._run_calendar_ops([
+            lambda d=monday + timedelta(days=i), rid=recipe.id: self._cookidoo.remove_recipe_from_calendar(d, rid)
+            for i, cal_day in enumerate(calendar_days)
+            for recipe in cal_day.recipes
+        ])
+        return sum(1 for result in results if not isinstance(result, Exception))
+
+    async def _run_calendar_ops(self, ops: list[Callable[[], Awaitable]],
+                                on_done: Callable[[], None] | None = None) -> list:
+        """Kalender-Operationen gleichzeitig ausführen (begrenzt, mit Retry).
+
+        Ergebnisse in Eingabe-Reihenfolge; fehlgeschlagene Operationen liefern
+        ihre Exception statt eines Ergebnisses. `on_done` läuft nach jeder
+        abgeschlossenen Operation (Fortschritt).
+        """
+        sem = asyncio.Semaphore(CALENDAR_CONCURRENCY)
+
+        async def run(op):
+            async with sem:
                 try:
-                    await self._cookidoo.remove_recipe_from_calendar(target_date, recipe.id)
-                    removed += 1
-                except Exception:
-                    pass
-        return removed
+                    return await _retry(op)
+                finally:
+                    if on_done:
+                        on_done()
+
+        return await asyncio.gather(*(run(op) for op in ops), return_exceptions=True)
+
+    def memory_estimate(self) -> int:
+        """Geschätzter Speicherbedarf in Bytes (für das Session-Budget)."""
+        recipes = (len(self._custom_recipes) + len(self._managed_recipes) + len(self._search_recipes)
+                   + len(self._starter_recipes) + len(self._dessert_recipes))
+        rows = len(self._pool) if self._pool is not None else 0
+        return PLANNER_BASE_BYTES + recipes * RECIPE_BYTES + rows * POOL_ROW_BYTES
+
+    @property
+    def is_logged_in(self) -> bool:
+        return self._cookidoo is not None and self._logged_in
+
+    def _pool_lists(self) -> dict[str, list[RecipeInfo]]:
+        return {
+            "custom": self._custom_recipes,
+            "managed": self._managed_recipes,
+            "search": self._search_recipes,
+            "starter": self._starter_recipes,
+            "dessert": self._dessert_recipes,
+        }
+
+    @property
+    def pools_version(self) -> int:
+        """Zähler, der sich bei jedem Ersetzen/Erweitern einer Rezeptliste erhöht."""
+        return self._pools_version
+
+    def snapshot_pools(self) -> dict:
+        """Rezeptlisten als JSON-taugliche Daten (Session-Snapshot für Neustarts)."""
+        return {
+            "country": self._country,
+            "language": self._language,
+            "pools": {name: [r.to_record() for r in recipes]
+                      for name, recipes in self._pool_lists().items()},
+        }
+
+    def restore_pools(self, snapshot: dict) -> int:
+        """Rezeptlisten aus einem Snapshot übernehmen statt neu zu laden.
+
+        Nur wenn der Snapshot zur aktuellen Locale passt; gibt die Anzahl
+        wiederhergestellter Rezepte zurück (0 = nichts übernommen).
+        """
+        if (snapshot.get("country"), snapshot.get("language")) != (self._country, self._language):
+            return 0
+        pools = snapshot.get("pools") or {}
+        restored = {name: [RecipeInfo.from_record(rec) for rec in pools.get(name, [])]
+                    for name in self._pool_lists()}
+        self._cancel_background()
+        self._custom_recipes = restored["custom"]
+        self._managed_recipes = restored["managed"]
+        self._search_recipes = restored["search"]
+        self._starter_recipes = restored["starter"]
+        self._dessert_recipes = restored["dessert"]
+        self._filter_fingerprint = None
+        self._pools_changed()
+        return sum(len(recipes) for recipes in restored.values())
 
     async def close(self):
+        self._cancel_background()
+        if self._enrich_task:
+            self._enrich_task.cancel()
         if self._session:
             await self._session.close()
             self._session = None
@@ -818,6 +1866,27 @@ class CookidooPlanner:
         return self._cookidoo
 
 
+def refresh_ingredient_facets(planners: list[CookidooPlanner], ahead: float) -> int:
+    """Facets, die innerhalb von `ahead` Sekunden ablaufen, im Hintergrund neu proben.
+
+    Periodisch auf dem Loop aufrufen; geprobt wird pro (Index, Sprache) mit einem
+    eingeloggten Planner dieser Sprache. Gibt die Anzahl gestarteter Erneuerungen zurück.
+    """
+    started = 0
+    done: set[tuple[str, str]] = set()
+    for planner in planners:
+        key = (ALGOLIA_INDEX, planner._language)
+        if key in done or not planner.is_logged_in or not planner._algolia_api_key:
+            continue
+        # Noch nie geprobte Keys übernimmt der Login
+        remaining = ingredient_facets.expires_in(key)
+        if remaining is None or remaining > ahead:
+            continue
+        done.add(key)
+        started += planner._refresh_facet(key)
+    return started
+
+
 class BringIntegration:
     """Bring! Einkaufslisten-Integration."""
 
@@ -0,0 +1,232 @@
+"""Spaltenbasierter Rezept-Pool für die Plan-Generierung."""
+
+from __future__ import annotations
+
+import random
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from planner import RecipeInfo
+
+# "eigene" = aus Cookidoo-Sammlungen, "neue" = Algolia-Suche
+OWN_SOURCES = ("custom", "managed")
+OTHER_SOURCES = ("search",)
+
+SOURCE_CODES = {"custom": 0, "managed": 1, "search": 2}
+POOL_TYPES = ("main", "starter", "dessert")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Einfache Plural-/Flexionsendungen (Reihenfolge zählt) mit minimaler Stammlänge;
+# "s" erst ab 4 Zeichen Stamm, damit "eis" nicht zu "ei" wird
+_SUFFIXES = (("en", 2), ("er", 2), ("n", 2), ("e", 2), ("s", 4))
+# Präfix-Suche erst ab dieser Länge, kürzere Begriffe matchen nur exakt
+_PREFIX_MIN = 4
+# Mindestlänge von Bestimmungs- und Grundwort bei Komposita ("frühlings|zwiebel")
+_COMPOUND_MIN = 3
+
+
+def _stem(word: str) -> str:
+    """Grundform eines Tokens: "zwiebeln" → "zwiebel", "eier" → "ei", "tomaten"/"tomate" → "tomat"."""
+    for suffix, min_len in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_len and not word.endswith("s" + suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+class RecipePool:
+    """Rezepte in Spalten statt als Objektlisten.
+
+    Jede Zeile ist ein Rezept, Zeilen sind aufsteigend nach total_time sortiert.
+    Parallele Arrays halten total_time, Quelle, Rating und Typ-Bitmaske, dazu ein
+    Index id → Zeile. Filter sind Bitmasken über alle Zeilen (Python-Ints als
+    Bitsets), kombiniert mit &, | und ~ in C-Geschwindigkeit:
+
+    - Zeitlimit: Präfix der sortierten Zeilen (Bisect) → (1 << n) - 1
+    - Quelle/Typ: vorberechnete Masken
+    - Ausschlüsse, Rating: Masken aus dem Index bzw. memoisiert
+    - Zutaten: invertierter Index Wortstamm → Zeilen (Zutatenfelder und Titel),
+      nachgeschlagen exakt, per Präfix und per Grundwort von Komposita
+
+    Gezogen wird per Rejection-Sampling auf der Ergebnismaske.
+    """
+
+    def __init__(self, recipes_by_type: dict[str, Iterable[RecipeInfo]]):
+        # Ein Rezept kann in mehreren Pools stecken (z.B. Salat als Haupt- und Vorspeise)
+        entries: dict[str, list] = {}
+        for recipe_type, recipes in recipes_by_type.items():
+            bit = 1 << POOL_TYPES.index(recipe_type)
+            for r in recipes:
+                entry = entries.get(r.id)
+                if entry is None:
+                    entries[r.id] = [r, bit]
+                else:
+                    entry[1] |= bit
+
+        rows = sorted(entries.values(), key=lambda e: e[0].total_time)
+        self._recipes: list[RecipeInfo] = [r for r, _ in rows]
+        self._times = array("q", (r.total_time for r in self._recipes))
+        self._sources = array("B", (SOURCE_CODES.get(r.source, SOURCE_CODES["search"]) for r in self._recipes))
+        self._ratings = array("d", (r.rating for r in self._recipes))
+        self._types = array("B", (bits for _, bits in rows))
+        self._index = {r.id: i for i, r in enumerate(self._recipes)}
+
+        self._type_masks = {t: 0 for t in POOL_TYPES}
+        self._source_masks = {s: 0 for s in SOURCE_CODES}
+        codes = {code: name for name, code in SOURCE_CODES.items()}
+        type_acc = {t: [] for t in POOL_TYPES}
+        source_acc = {s: [] for s in SOURCE_CODES}
+        for i, (source, types) in enumerate(zip(self._sources, self._types)):
+            source_acc[codes[source]].append(i)
+            for n, t in enumerate(POOL_TYPES):
+                if types >> n & 1:
+                    type_acc[t].append(i)
+        for t, idx in type_acc.items():
+            self._type_masks[t] = self._bits(idx)
+        for s, idx in source_acc.items():
+            self._source_masks[s] = self._bits(idx)
+
+        # Invertierter Zutaten-Index: Wortstamm → Zeilen. Titelwörter zählen mit,
+        # für Rezepte, deren Zutaten (noch) nicht bekannt sind.
+        self._tokens: dict[str, list[int]] = {}
+        for i, r in enumerate(self._recipes):
+            words = set(_TOKEN_RE.findall(r.name.lower()))
+            for ingredient in r.ingredients:
+                words.update(_TOKEN_RE.findall(ingredient))
+            for stem in {_stem(word) for word in words}:
+                self._tokens.setdefault(stem, []).append(i)
+        # Sortierte Stämme für Präfix-Suche, rückwärts sortiert für Grundwörter von Komposita
+        self._token_keys = sorted(self._tokens)
+        self._reversed_keys = sorted(stem[::-1] for stem in self._tokens)
+
+        self._ingredient_masks: dict[tuple[str, ...], int] = {}
+        self._rating_masks: dict[float, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._recipes)
+
+    @staticmethod
+    def _bits(rows: Iterable[int]) -> int:
+        mask = 0
+        for i in rows:
+            mask |= 1 << i
+        return mask
+
+    def _ids_mask(self, ids: Iterable[str]) -> int:
+        index = self._index
+        return self._bits(index[rid] for rid in ids if rid in index)
+
+    def _term_rows(self, term: str) -> set[int]:
+        """Zeilen, die einen Begriff als Zutat oder im Titel enthalten.
+
+        Jedes Wort wird auf seinen Stamm gebracht ("zwiebeln" → "zwiebel") und
+        exakt nachgeschlagen; ab `_COMPOUND_MIN` Zeichen auch als Grundwort von
+        Komposita ("frühlingszwiebeln", "rindfleisch"), ab `_PREFIX_MIN` Zeichen
+        als Präfix ("zwieb"). Beides per Bisect auf sortierten Stämmen, kurze
+        Begriffe wie "ei" treffen so nicht "reis" oder "weizenmehl". Mehrere
+        Wörter müssen alle vorkommen.
+        """
+        rows: set[int] | None = None
+        for word in _TOKEN_RE.findall(term):
+            stem = _stem(word)
+            hits = set(self._tokens.get(stem, ()))
+            if len(stem) >= _PREFIX_MIN:
+                for key in self._scan(self._token_keys, stem):
+                    hits.update(self._tokens[key])
+            if len(stem) >= _COMPOUND_MIN:
+                for key in self._scan(self._reversed_keys, stem[::-1]):
+                    if len(key) - len(stem) >= _COMPOUND_MIN:
+                        hits.update(self._tokens[key[::-1]])
+            rows = hits if rows is None else rows & hits
+        return rows or set()
+
+    @staticmethod
+    def _scan(keys: list[str], prefix: str) -> Iterable[str]:
+        """Alle Schlüssel einer sortierten Liste, die mit `prefix` beginnen."""
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            yield keys[i]
+            i += 1
+
+    def _ingredient_mask(self, exclude_ingredients: list[str] | None) -> int:
+        """Zeilen mit einer ausgeschlossenen Zutat (memoisiert pro Zutatenliste)."""
+        key = tuple(sorted({i.lower().strip() for i in exclude_ingredients or [] if i.strip()}))
+        if not key:
+            return 0
+        mask = self._ingredient_masks.get(key)
+        if mask is None:
+            rows: set[int] = set()
+            for term in key:
+                rows |= self._term_rows(term)
+            mask = self._bits(rows)
+            self._ingredient_masks[key] = mask
+        return mask
+
+    def _rating_mask(self, min_rating: float) -> int:
+        """Zeilen mit Rating >= min_rating (0 = unbewertet, passt immer)."""
+        mask = self._rating_masks.get(min_rating)
+        if mask is None:
+            mask = self._bits(i for i, v in enumerate(self._ratings) if v == 0 or v >= min_rating)
+            self._rating_masks[min_rating] = mask
+        return mask
+
+    def _mask(self, recipe_type: str, sources: Iterable[str] | None, max_minutes: int | None,
+              exclude: Iterable[str], exclude_ingredients: list[str] | None,
+              min_rating: float | None) -> tuple[int, int]:
+        """Ergebnismaske und Zeilenlimit (Zeitlimit-Präfix) für eine Abfrage."""
+        if max_minutes is None:
+            limit = len(self._recipes)
+        else:
+            # total_time 0 = unbekannt, sortiert vorne und passt immer
+            limit = bisect_right(self._times, max_minutes * 60)
+        mask = self._type_masks.get(recipe_type, 0) & ((1 << limit) - 1)
+        if sources is not None:
+            source_mask = 0
+            for s in sources:
+                source_mask |= self._source_masks.get(s, 0)
+            mask &= source_mask
+        if min_rating:
+            mask &= self._rating_mask(min_rating)
+        excluded = self._ids_mask(exclude) | self._ingredient_mask(exclude_ingredients)
+        return mask & ~excluded, limit
+
+    def count(self, recipe_type: str, sources: Iterable[str] | None = None,
+              max_minutes: int | None = None, exclude: Iterable[str] = (),
+              exclude_ingredients: list[str] | None = None, min_rating: float | None = None) -> int:
+        """Anzahl verfügbarer Rezepte nach Zeitlimit, Quelle, Rating und Ausschlüssen."""
+        mask, _ = self._mask(recipe_type, sources, max_minutes, exclude, exclude_ingredients, min_rating)
+        return mask.bit_count()
+
+    def sample(self, recipe_type: str, k: int, sources: Iterable[str] | None = None,
+               max_minutes: int | None = None, exclude: Iterable[str] = (),
+               exclude_ingredients: list[str] | None = None,
+               min_rating: float | None = None) -> list[RecipeInfo]:
+        """Bis zu k verschiedene, passende Rezepte zufällig ziehen."""
+        if k <= 0:
+            return []
+        mask, limit = self._mask(recipe_type, sources, max_minutes, exclude, exclude_ingredients, min_rating)
+        available = mask.bit_count()
+        if not available:
+            return []
+        k = min(k, available)
+
+        rows: list[int] = []
+        if available * 8 >= limit:
+            # Dichte Maske: Zufallszeilen ziehen und Bit prüfen
+            chosen: set[int] = set()
+            attempts = 0
+            while len(rows) < k and attempts < 8 * k + 32:
+                attempts += 1
+                i = random.randrange(limit)
+                if mask >> i & 1 and i not in chosen:
+                    chosen.add(i)
+                    rows.append(i)
+        if len(rows) < k:
+            # Dünne Maske: gesetzte Bits aufzählen und daraus ziehen
+            bits = bin(mask)[:1:-1]
+            candidates = [i for i, b in enumerate(bits) if b == "1" and i not in rows]
+            rows += random.sample(candidates, k - len(rows))
+        return [self._recipes[i] for i in rows]
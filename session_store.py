@@ -0,0 +1,128 @@
+"""Begrenzte Registry der aktiven User-Sessions (LRU, Idle-Ablauf, Speicherbudget)."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+log = logging.getLogger("cookidoo")
+
+
+class SessionRegistry:
+    """Thread-sichere LRU-Registry mit Idle-TTL und Speicherbudget.
+
+    Verdrängt werden, jeweils älteste zuerst:
+    - Sessions, die länger als `idle_ttl` Sekunden nicht benutzt wurden,
+    - Sessions über `max_sessions`,
+    - Sessions, solange die geschätzte Gesamtgrösse `memory_budget` übersteigt.
+
+    Verdrängte Sessions werden an `on_evict` übergeben (z.B. Planner schliessen).
+    Sessions, für die `busy` True liefert, und die gerade angefragte bleiben.
+    """
+
+    def __init__(self, factory: Callable[[], Any], on_evict: Callable[[str, Any], None],
+                 size_of: Callable[[Any], int], busy: Callable[[str], bool] = lambda _: False,
+                 max_sessions: int = 200, idle_ttl: float = 1800.0, memory_budget: int = 0):
+        self.factory = factory
+        self.on_evict = on_evict
+        self.size_of = size_of
+        self.busy = busy
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.memory_budget = memory_budget  # Bytes, 0 = unbegrenzt
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted = {"idle": 0, "lru": 0, "memory": 0, "removed": 0}
+
+    def get(self, username: str) -> Any:
+        """Session holen oder erstellen; danach überzählige Sessions verdrängen."""
+        with self._lock:
+            entry = self._data.get(username)
+            value = entry[1] if entry else self.factory()
+            if entry is None:
+                self.created += 1
+            self._data[username] = (time.monotonic(), value)
+            self._data.move_to_end(username)
+            evicted = self._evict(keep=username)
+        self._close(evicted)
+        return value
+
+    def remove(self, username: str) -> Any | None:
+        """Session entfernen (Logout, gelöschter User) und schliessen."""
+        with self._lock:
+            entry = self._data.pop(username, None)
+            if entry:
+                self.evicted["removed"] += 1
+        if entry:
+            self._close([(username, entry[1], "removed")])
+        return entry[1] if entry else None
+
+    def sweep(self) -> int:
+        """Abgelaufene Sessions verdrängen (periodisch aufrufen); Anzahl verdrängter."""
+        with self._lock:
+            evicted = self._evict(keep=None)
+        self._close(evicted)
+        return len(evicted)
+
+    def _evict(self, keep: str | None) -> list[tuple[str, Any, str]]:
+        evicted: list[tuple[str, Any, str]] = []
+        candidates = [u for u in self._data if u != keep and not self.busy(u)]
+
+        def drop(username: str, reason: str) -> None:
+            _, value = self._data.pop(username)
+            self.evicted[reason] += 1
+            evicted.append((username, value, reason))
+
+        cutoff = time.monotonic() - self.idle_ttl
+        for username in list(candidates):
+            if self._data[username][0] < cutoff:
+                drop(username, "idle")
+                candidates.remove(username)
+
+        while len(self._data) > self.max_sessions and candidates:
+            drop(candidates.pop(0), "lru")
+
+        if self.memory_budget:
+            total = sum(self.size_of(v) for _, v in self._data.values())
+            while total > self.memory_budget and candidates:
+                username = candidates.pop(0)
+                total -= self.size_of(self._data[username][1])
+                drop(username, "memory")
+        return evicted
+
+    def _close(self, evicted: list[tuple[str, Any, str]]) -> None:
+        for username, value, reason in evicted:
+            log.info(f"[{username}] Session verdrängt ({reason})")
+            try:
+                self.on_evict(username, value)
+            except Exception as e:
+                log.warning(f"[{username}] Session schliessen fehlgeschlagen: {e}")
+
+    def values(self) -> list[Any]:
+        """Momentaufnahme der aktiven Sessions (ohne sie als benutzt zu markieren)."""
+        with self._lock:
+            return [value for _, value in self._data.values()]
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            sizes = [self.size_of(v) for _, v in self._data.values()]
+            now = time.monotonic()
+            oldest_idle = max((now - t for t, _ in self._data.values()), default=0.0)
+        return {
+            "live": len(sizes),
+            "max_sessions": self.max_sessions,
+            "idle_ttl": self.idle_ttl,
+            "estimated_bytes": sum(sizes),
+            "memory_budget": self.memory_budget,
+            "oldest_idle_s": round(oldest_idle),
+            "created": self.created,
+            "evicted": dict(self.evicted),
+        }
@@ -96,6 +96,17 @@ async function apiDelete(url) {
     return result;
 }
 
+// Hintergrund-Job abfragen, bis er fertig ist; onProgress(done, total) bei jedem Poll
+async function pollJob(jobId, onProgress, interval = 1000) {
+    while (true) {
+        const { job } = await apiGet(`/api/jobs/${jobId}`);
+        if (onProgress) onProgress(job.progress.done, job.progress.total);
+        if (job.status === "done") return job.result;
+        if (job.status === "failed") throw new Error(job.error || "Job fehlgeschlagen");
+        await new Promise(resolve => setTimeout(resolve, interval));
+    }
+}
+
 function escapeHtml(text) {
     const div = document.createElement("div");
     div.textContent = text;
@@ -978,17 +989,21 @@ document.getElementById("invite-close-btn").addEventListener("click", () => {
 
 async function tryAutoConnectCookidoo() {
     try {
-        const creds = await apiGet("/api/cookidoo-credentials");
-        if (!creds.has_credentials) { showLoginScreen(false); return; }
-
+        // Server stellt die Session selbst wieder her (gespeicherte Zugangsdaten + Snapshot)
         showLoading("Cookidoo wird verbunden...");
+        const resumed = await apiCall("/api/resume");
+        if (!resumed.has_credentials) { hideLoading(); showLoginScreen(false); return; }
+
         try {
-            await apiCall("/api/login", {
-                email: creds.email, password: creds.password,
-                country: creds.country, language: creds.language,
-            });
-            showLoading("Sammlungen werden geladen...");
-            await apiCall("/api/collections");
+            if (!resumed.success) {
+                const creds = await apiGet("/api/cookidoo-credentials");
+                await apiCall("/api/login", {
+                    email: creds.email, password: creds.password,
+                    country: creds.country, language: creds.language,
+                });
+                showLoading("Sammlungen werden geladen...");
+                await apiCall("/api/collections");
+            }
 
             await loadFiltersFromServer();
             showScreen("main-app");
@@ -1000,6 +1015,7 @@ async function tryAutoConnectCookidoo() {
             showLoginScreen(true);
         }
     } catch (err) {
+        hideLoading();
         showLoginScreen(false);
     }
 }
@@ -1327,11 +1343,14 @@ document.getElementById("save-btn").addEventListener("click", async () => {
     showLoading("Wird in Cookidoo gespeichert...");
     hideStatus("save-status");
     try {
-        const result = await apiCall("/api/save", {
+        const { job_id } = await apiCall("/api/save", {
             week_offset: weekOffset,
             clear_first: clearFirst,
             add_to_shopping_list: addShoppingList,
         });
+        const result = await pollJob(job_id, (done, total) => {
+            if (total > 0) showLoading(`Wird in Cookidoo gespeichert... (${done}/${total})`);
+        });
         let msg = `${result.saved.length} Rezepte gespeichert!`;
         if (result.shopping_added > 0) msg += ` ${result.shopping_added} Zutaten zur Einkaufsliste hinzugefügt.`;
         if (result.errors && result.errors.length > 0) msg += ` (${result.errors.length} Fehler)`;